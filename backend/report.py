@@ -0,0 +1,162 @@
+"""PDF rendering for meeting reports.
+
+Kept apart from server.py so report worker processes only import reportlab,
+not the web application. Every function here takes plain data (dicts, lists,
+strings and datetimes), never database handles.
+
+reportlab is imported inside generate_pdf_report: server.py imports this module
+to hand the function to the worker pool, and should not pay for reportlab at
+startup. Only the worker process that renders a report loads it.
+"""
+import io
+from datetime import datetime
+
+def generate_pdf_report(meeting_data, participants_data, polls_data):
+    """Generate PDF report for the meeting and return it as bytes"""
+    from reportlab.lib.pagesizes import A4
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.units import inch
+    from reportlab.lib import colors
+    from reportlab.lib.enums import TA_CENTER
+    
+    # Render in memory, nothing is written to disk
+    buffer = io.BytesIO()
+    
+    # Create PDF document
+    doc = SimpleDocTemplate(buffer, pagesize=A4)
+    styles = getSampleStyleSheet()
+    story = []
+    
+    # Title style
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=24,
+        textColor=colors.HexColor('#1e40af'),
+        alignment=TA_CENTER,
+        spaceAfter=30
+    )
+    
+    # Subtitle style
+    subtitle_style = ParagraphStyle(
+        'CustomSubtitle',
+        parent=styles['Heading2'],
+        fontSize=16,
+        textColor=colors.HexColor('#374151'),
+        spaceAfter=20
+    )
+    
+    # Add title
+    story.append(Paragraph("RAPPORT DE VOTE SECRET", title_style))
+    story.append(Spacer(1, 20))
+    
+    # Meeting info
+    story.append(Paragraph(f"<b>Réunion:</b> {meeting_data['title']}", styles['Normal']))
+    story.append(Paragraph(f"<b>Organisateur:</b> {meeting_data['organizer_name']}", styles['Normal']))
+    story.append(Paragraph(f"<b>Code de réunion:</b> {meeting_data['meeting_code']}", styles['Normal']))
+    story.append(Paragraph(f"<b>Date de génération:</b> {datetime.now().strftime('%d/%m/%Y à %H:%M')}", styles['Normal']))
+    story.append(Spacer(1, 30))
+    
+    # Participants section
+    story.append(Paragraph("PARTICIPANTS APPROUVÉS", subtitle_style))
+    
+    # Create participants table
+    approved_participants = [p for p in participants_data if p['approval_status'] == 'approved']
+    
+    if approved_participants:
+        participants_table_data = [['#', 'Nom', 'Heure de participation']]
+        for i, participant in enumerate(approved_participants, 1):
+            # Handle both datetime objects and ISO strings
+            if isinstance(participant['joined_at'], str):
+                joined_time = datetime.fromisoformat(participant['joined_at'].replace('Z', '+00:00')).strftime('%H:%M')
+            else:
+                joined_time = participant['joined_at'].strftime('%H:%M')
+            participants_table_data.append([str(i), participant['name'], joined_time])
+        
+        participants_table = Table(participants_table_data, colWidths=[0.5*inch, 3*inch, 1.5*inch])
+        participants_table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#f3f4f6')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 12),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+            ('FONTSIZE', (0, 1), (-1, -1), 10),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ]))
+        story.append(participants_table)
+        story.append(Paragraph(f"<b>Total des participants approuvés:</b> {len(approved_participants)}", styles['Normal']))
+    else:
+        story.append(Paragraph("Aucun participant approuvé", styles['Normal']))
+    
+    story.append(Spacer(1, 30))
+    
+    # Polls section
+    story.append(Paragraph("RÉSULTATS DES SONDAGES", subtitle_style))
+    
+    if polls_data:
+        for i, poll in enumerate(polls_data, 1):
+            # Poll question
+            story.append(Paragraph(f"<b>Sondage {i}:</b> {poll['question']}", styles['Heading3']))
+            story.append(Spacer(1, 10))
+            
+            # Calculate total votes
+            total_votes = sum(opt['votes'] for opt in poll['options'])
+            
+            if total_votes > 0:
+                # Create results table
+                results_data = [['Option', 'Votes', 'Pourcentage']]
+                for option in poll['options']:
+                    percentage = (option['votes'] / total_votes * 100) if total_votes > 0 else 0
+                    results_data.append([
+                        option['text'],
+                        str(option['votes']),
+                        f"{percentage:.1f}%"
+                    ])
+                
+                # Add total row
+                results_data.append(['TOTAL', str(total_votes), '100.0%'])
+                
+                results_table = Table(results_data, colWidths=[3*inch, 1*inch, 1*inch])
+                results_table.setStyle(TableStyle([
+                    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#f3f4f6')),
+                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
+                    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+                    ('ALIGN', (1, 0), (-1, -1), 'CENTER'),
+                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                    ('FONTSIZE', (0, 0), (-1, 0), 11),
+                    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+                    ('BACKGROUND', (0, 1), (-1, -2), colors.white),
+                    ('BACKGROUND', (0, -1), (-1, -1), colors.HexColor('#e5e7eb')),
+                    ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
+                    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+                    ('FONTSIZE', (0, 1), (-1, -1), 10),
+                    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+                ]))
+                story.append(results_table)
+            else:
+                story.append(Paragraph("Aucun vote enregistré pour ce sondage", styles['Normal']))
+            
+            story.append(Spacer(1, 20))
+    else:
+        story.append(Paragraph("Aucun sondage n'a été créé lors de cette réunion", styles['Normal']))
+    
+    # Footer
+    story.append(Spacer(1, 50))
+    footer_style = ParagraphStyle(
+        'Footer',
+        parent=styles['Normal'],
+        fontSize=9,
+        textColor=colors.grey,
+        alignment=TA_CENTER
+    )
+    story.append(Paragraph("Rapport généré par le système Vote Secret", footer_style))
+    story.append(Paragraph("Toutes les données de cette réunion ont été supprimées après génération de ce rapport", footer_style))
+    
+    # Build PDF
+    doc.build(story)
+    
+    return buffer.getvalue()
@@ -1,63 +1,680 @@
-from fastapi import FastAPI, APIRouter, HTTPException, WebSocket, WebSocketDisconnect
-from fastapi.responses import FileResponse
+import time
+# Module import time is part of the cold start, measured from here to the end of the file
+IMPORT_STARTED = time.perf_counter()
+
+from fastapi import FastAPI, APIRouter, HTTPException, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import Response, StreamingResponse
+from fastapi.encoders import jsonable_encoder
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ReturnDocument, CursorType, monitoring
+from pymongo.errors import BulkWriteError, CollectionInvalid, DuplicateKeyError
 import os
+import asyncio
 import logging
 from pathlib import Path
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
 import uuid
-from datetime import datetime
+from datetime import datetime, timedelta
 from enum import Enum
-import json
-import tempfile
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.lib import colors
-from reportlab.lib.enums import TA_CENTER, TA_LEFT
+from collections import deque, OrderedDict
+import orjson
+import heapq
+import csv
+import codecs
+import secrets
+import multiprocessing
+import threading
+from contextvars import Context, ContextVar
+from concurrent.futures import ProcessPoolExecutor
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess
+from report import generate_pdf_report
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
+# MongoDB commands slower than this are logged, in milliseconds
+MONGO_SLOW_QUERY_MS = float(os.environ.get('MONGO_SLOW_QUERY_MS', '100'))
+
+# Commands left out of the timings and the slow log: (command, collection).
+# The broadcast tail's awaitData getMores block on purpose until an event arrives.
+UNTIMED_COMMANDS = {("getMore", "meeting_events")}
+
+# MongoDB command tracing
+class RequestTimings:
+    """MongoDB time spent by one HTTP request, per command and collection.
+    
+    Writes batched by a background task are not issued by the request, so the
+    time it waits for them is recorded as a named wait instead.
+    """
+
+    def __init__(self, scope):
+        self.scope = scope
+        self.commands: Dict[str, list] = {}
+        self.waits: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def route(self) -> str:
+        route = self.scope.get("route")
+        return route.path if route else "unmatched"
+
+    def add(self, command: str, collection: str, seconds: float):
+        # Motor runs commands on executor threads, possibly several at once for one request
+        with self._lock:
+            entry = self.commands.setdefault(f"{command}.{collection}", [0, 0.0])
+            entry[0] += 1
+            entry[1] += seconds
+
+    def add_wait(self, name: str, seconds: float):
+        with self._lock:
+            self.waits[name] = self.waits.get(name, 0.0) + seconds
+
+    def server_timing(self, total_seconds: float) -> str:
+        """Server-Timing header value: total, MongoDB total, each command and collection, then waits"""
+        with self._lock:
+            commands = [(key, count, seconds) for key, (count, seconds) in self.commands.items()]
+            waits = list(self.waits.items())
+        mongo_ms = sum(seconds for _, _, seconds in commands) * 1000
+        entries = [f"app;dur={total_seconds * 1000:.1f}",
+                   f'mongo;dur={mongo_ms:.1f};desc="{sum(count for _, count, _ in commands)} commands"']
+        for key, count, seconds in commands:
+            name = key.replace(".", "-").replace("_", "-")
+            entries.append(f'mongo-{name};dur={seconds * 1000:.1f};desc="{count}x {key}"')
+        for name, seconds in waits:
+            entries.append(f"{name};dur={seconds * 1000:.1f}")
+        return ", ".join(entries)
+
+# Timings of the HTTP request being served; None for background tasks
+request_timings: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+class MongoCommandListener(monitoring.CommandListener):
+    """Times every MongoDB command and attributes it to the route that issued it.
+    
+    Motor copies the caller's context to the executor thread running the
+    command, so `request_timings` still identifies the originating request.
+    """
+
+    def __init__(self):
+        self.collections: Dict[tuple, str] = {}
+
+    def started(self, event):
+        # Most commands name their collection as their own value, getMore as "collection"
+        collection = event.command.get("collection") if event.command_name == "getMore" \
+            else event.command.get(event.command_name)
+        self.collections[(event.connection_id, event.request_id)] = \
+            collection if isinstance(collection, str) else "-"
+
+    def succeeded(self, event):
+        self._record(event)
+
+    def failed(self, event):
+        self._record(event)
+
+    def _record(self, event):
+        collection = self.collections.pop((event.connection_id, event.request_id), "-")
+        if (event.command_name, collection) in UNTIMED_COMMANDS:
+            return
+        seconds = event.duration_micros / 1_000_000
+        timings = request_timings.get()
+        route = timings.route if timings else "background"
+        if timings:
+            timings.add(event.command_name, collection, seconds)
+        MONGO_COMMAND_SECONDS.labels(event.command_name, collection, route).observe(seconds)
+        if seconds * 1000 >= MONGO_SLOW_QUERY_MS:
+            logger.warning(f"Slow MongoDB {event.command_name} on {collection} took "
+                           f"{seconds * 1000:.1f} ms ({route})")
+
+# MongoDB connection pool (connections per worker); MONGO_MIN_POOL_SIZE are opened at startup
+MONGO_MAX_POOL_SIZE = int(os.environ.get('MONGO_MAX_POOL_SIZE', '100'))
+MONGO_MIN_POOL_SIZE = int(os.environ.get('MONGO_MIN_POOL_SIZE', '10'))
+# Seconds startup waits for MongoDB before serving anyway, with /api/ reporting "starting"
+MONGO_STARTUP_WAIT = float(os.environ.get('MONGO_STARTUP_WAIT', '5'))
+
 # MongoDB connection
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+client = AsyncIOMotorClient(
+    mongo_url,
+    maxPoolSize=MONGO_MAX_POOL_SIZE,
+    minPoolSize=MONGO_MIN_POOL_SIZE,
+    event_listeners=[MongoCommandListener()]
+)
 db = client[os.environ['DB_NAME']]
 
+# Indexes ensured at startup, per collection: (keys, options)
+INDEXES = {
+    "meetings": [
+        ([("id", 1)], {"unique": True}),
+        ([("meeting_code", 1)], {}),
+    ],
+    "participants": [
+        ([("id", 1)], {"unique": True}),
+        ([("meeting_id", 1), ("name", 1)], {"unique": True}),
+        ([("meeting_id", 1), ("member_code", 1)],
+         {"unique": True, "partialFilterExpression": {"member_code": {"$type": "string"}}}),
+    ],
+    "polls": [
+        ([("id", 1)], {"unique": True}),
+        ([("meeting_id", 1)], {}),
+    ],
+    "votes": [
+        ([("poll_id", 1), ("option_id", 1)], {}),
+    ],
+}
+
+# Meeting-code lookups cached for the join path (seconds, entries)
+MEETING_CACHE_TTL = float(os.environ.get('MEETING_CACHE_TTL', '30'))
+MEETING_CACHE_SIZE = int(os.environ.get('MEETING_CACHE_SIZE', '1024'))
+
+# Vote tally settings (seconds a batch stays open, votes per batch)
+TALLY_FLUSH_INTERVAL = float(os.environ.get('TALLY_FLUSH_INTERVAL', '0.005'))
+TALLY_MAX_BATCH = int(os.environ.get('TALLY_MAX_BATCH', '500'))
+
+# WebSocket fan-out settings (messages buffered per socket, "drop" or "disconnect" when full)
+WS_SEND_QUEUE_SIZE = int(os.environ.get('WS_SEND_QUEUE_SIZE', '100'))
+WS_SLOW_CONSUMER_POLICY = os.environ.get('WS_SLOW_CONSUMER_POLICY', 'disconnect')
+# Recent events kept per meeting to replay to reconnecting sockets
+WS_REPLAY_BUFFER_SIZE = int(os.environ.get('WS_REPLAY_BUFFER_SIZE', '256'))
+# Seconds between heartbeat pings, and how long past a ping a silent socket is kept
+WS_HEARTBEAT_INTERVAL = float(os.environ.get('WS_HEARTBEAT_INTERVAL', '20'))
+WS_HEARTBEAT_TIMEOUT = float(os.environ.get('WS_HEARTBEAT_TIMEOUT', '10'))
+
+# Where meeting events are published: "memory" (single worker) or "mongo" (shared by all workers)
+BROADCAST_BACKEND = os.environ.get('BROADCAST_BACKEND', 'memory')
+BROADCAST_CAPPED_SIZE = int(os.environ.get('BROADCAST_CAPPED_SIZE', str(16 * 1024 * 1024)))
+# Seconds the mongo backend holds later events back while waiting for a missing one
+BROADCAST_GAP_TIMEOUT = float(os.environ.get('BROADCAST_GAP_TIMEOUT', '5'))
+
+# Documents fetched per cursor round trip when streaming large collections
+CURSOR_BATCH_SIZE = int(os.environ.get('CURSOR_BATCH_SIZE', '500'))
+
+# Participants written per insert_many when importing a roster
+ROSTER_IMPORT_BATCH_SIZE = int(os.environ.get('ROSTER_IMPORT_BATCH_SIZE', '500'))
+
+# Worker processes rendering PDF reports; further report requests wait their turn
+REPORT_WORKERS = int(os.environ.get('REPORT_WORKERS', '1'))
+
+# Longest a /wait long-poll request is held open, in seconds
+LONG_POLL_MAX_TIMEOUT = float(os.environ.get('LONG_POLL_MAX_TIMEOUT', '30'))
+
+# Minimum seconds between two vote_submitted broadcasts of the same poll
+VOTE_BROADCAST_WINDOW = float(os.environ.get('VOTE_BROADCAST_WINDOW', '0.2'))
+
 # Create the main app without a prefix
 app = FastAPI()
 
 # Create a router with the /api prefix
 api_router = APIRouter(prefix="/api")
 
+# Directory where every worker writes its metrics so /api/metrics can sum them. prometheus_client
+# reads it on import, so it must be set in the process environment (not .env) and emptied before
+# the workers start; unset, each worker reports only its own metrics
+PROMETHEUS_MULTIPROC_DIR = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+
+# Prometheus metrics, exposed on /api/metrics
+REQUEST_LATENCY = Histogram(
+    "vote_http_request_duration_seconds", "HTTP request latency until the response is fully sent",
+    ["method", "route", "status"]
+)
+BROADCAST_FANOUT_SECONDS = Histogram(
+    "vote_broadcast_fanout_seconds", "Time to queue one meeting event for every local socket",
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1)
+)
+BROADCAST_FAILED_SENDS = Counter(
+    "vote_broadcast_failed_sends_total", "Meeting events that did not reach a socket", ["reason"]
+)
+VOTES_RECORDED = Counter("vote_votes_recorded_total", "Votes acknowledged, per poll", ["poll_id"])
+MONGO_COMMAND_SECONDS = Histogram(
+    "vote_mongo_command_duration_seconds", "MongoDB command latency, per command, collection and route",
+    ["command", "collection", "route"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1)
+)
+STARTUP_SECONDS = Gauge(
+    "vote_startup_seconds", "Cold start timings of each worker: module import, database warm-up, first request",
+    ["phase"], multiprocess_mode="liveall"
+)
+WEBSOCKET_CONNECTIONS = Gauge(
+    "vote_websocket_connections", "Open WebSocket connections per meeting", ["meeting_id"],
+    multiprocess_mode="livesum"
+)
+PDF_RENDER_SECONDS = Histogram(
+    "vote_pdf_render_seconds", "Time to render a meeting report PDF",
+    buckets=(0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+)
+
+def record_startup_timing(phase: str, seconds: float):
+    STARTUP_SECONDS.labels(phase).set(seconds)
+    logger.info(f"Startup timing: {phase} took {seconds * 1000:.1f} ms")
+
+class MetricsMiddleware:
+    """Records the latency of every HTTP request under its route template.
+    
+    Also collects the MongoDB commands the request issues and reports them in a
+    Server-Timing header. Commands run while a streamed body is being sent come
+    after the headers, so they only show up in the metrics.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.first_request = True
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        start = time.perf_counter()
+        status = 500
+        timings = RequestTimings(scope)
+        token = request_timings.set(timings)
+        
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"server-timing", timings.server_timing(time.perf_counter() - start).encode())
+                ]
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            request_timings.reset(token)
+            if self.first_request:
+                self.first_request = False
+                record_startup_timing("first_request", time.perf_counter() - start)
+            # Templates rather than raw paths keep the label set bounded
+            route = scope.get("route")
+            REQUEST_LATENCY.labels(
+                scope["method"], route.path if route else "unmatched", str(status)
+            ).observe(time.perf_counter() - start)
+
+# Meeting event broadcast backends
+class InMemoryBroadcastBackend:
+    """Delivers meeting events to this process only. Used with a single worker and in tests."""
+
+    def __init__(self):
+        self.sequences: Dict[str, int] = {}
+        self.handler = None
+
+    async def start(self, handler):
+        self.handler = handler
+
+    async def stop(self):
+        self.handler = None
+
+    async def publish(self, meeting_id: str, message: dict):
+        seq = self.sequences.get(meeting_id, 0) + 1
+        self.sequences[meeting_id] = seq
+        if message.get("type") == "meeting_completed":
+            del self.sequences[meeting_id]
+        if self.handler:
+            await self.handler(meeting_id, seq, message)
+
+class MongoBroadcastBackend:
+    """Shares meeting events between worker processes through a capped collection.
+    
+    Publishers take the meeting's next seq and a global event position from one
+    counter document in a single atomic update, so every worker stamps an event
+    the same way and positions follow seqs, then append the event to the capped
+    collection. Two publishers may append out of order, so each worker tails
+    the collection with a tailable cursor, holds events back until the ones
+    before them have arrived and hands them to its own ConnectionManager in
+    position order, including the events it published itself. A reopened
+    cursor resumes from the next position it expects.
+    
+    Capped documents outlive the meeting they belong to, so meeting events
+    carry ids only, never names or other participant data. The seq of a
+    meeting is dropped from the counter with it.
+    """
+
+    COUNTER_ID = "meeting_events"
+
+    def __init__(self, database, size_bytes: int, gap_timeout: float = BROADCAST_GAP_TIMEOUT):
+        self.database = database
+        self.size_bytes = size_bytes
+        self.gap_timeout = gap_timeout
+        self.events = database.meeting_events
+        self.counters = database.meeting_event_counters
+        self.handler = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self, handler):
+        self.handler = handler
+        try:
+            await self.database.create_collection("meeting_events", capped=True, size=self.size_bytes)
+        except CollectionInvalid:
+            pass  # Already created by another worker
+        
+        # A tailable cursor on an empty capped collection dies immediately
+        if not await self.events.find_one():
+            await self.events.insert_one({"meeting_id": None})
+        counter = await self.counters.find_one({"_id": self.COUNTER_ID})
+        self._task = asyncio.create_task(self._tail((counter or {}).get("position", 0) + 1))
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def publish(self, meeting_id: str, message: dict):
+        counter = await self.counters.find_one_and_update(
+            {"_id": self.COUNTER_ID},
+            {"$inc": {"position": 1, f"seqs.{meeting_id}": 1}},
+            projection={"position": 1, f"seqs.{meeting_id}": 1},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        await self.events.insert_one({
+            "meeting_id": meeting_id,
+            "position": counter["position"],
+            "seq": counter["seqs"][meeting_id],
+            "message": jsonable_encoder(message)
+        })
+        if message.get("type") == "meeting_completed":
+            await self.counters.update_one({"_id": self.COUNTER_ID}, {"$unset": {f"seqs.{meeting_id}": ""}})
+
+    async def _tail(self, next_position: int):
+        held: Dict[int, dict] = {}
+        gap_since = None
+        while True:
+            try:
+                # Tailable cursors cannot use an index: opening one scans the collection,
+                # so the same cursor is kept for as long as the server keeps it alive
+                cursor = self.events.find(
+                    {"position": {"$gte": next_position}}, cursor_type=CursorType.TAILABLE_AWAIT
+                )
+                while cursor.alive:
+                    # Ends after an empty awaitData getMore, while the cursor stays open
+                    async for event in cursor:
+                        held[event["position"]] = event
+                        next_position = await self._deliver_in_order(held, next_position)
+                    
+                    # A publisher that took a position and never appended it leaves a gap
+                    # for good; give up on it once it has held events back long enough
+                    if not held:
+                        gap_since = None
+                    elif gap_since is None:
+                        gap_since = time.monotonic()
+                    elif time.monotonic() - gap_since >= self.gap_timeout:
+                        logger.warning(f"Skipping meeting events {next_position}-{min(held) - 1}, never published")
+                        next_position = await self._deliver_in_order(held, min(held))
+                        gap_since = None
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error tailing meeting events: {str(e)}")
+            # The cursor died (e.g. it fell behind the capped collection); reopen it
+            await asyncio.sleep(0.1)
+
+    async def _deliver_in_order(self, held: Dict[int, dict], next_position: int) -> int:
+        """Hand over the held events that follow `next_position` without a gap, return the next one expected"""
+        while next_position in held:
+            event = held.pop(next_position)
+            next_position += 1
+            if self.handler:
+                await self.handler(event["meeting_id"], event["seq"], event["message"])
+        return next_position
+
+def create_broadcast_backend(name: str):
+    if name == "memory":
+        return InMemoryBroadcastBackend()
+    if name == "mongo":
+        return MongoBroadcastBackend(db, BROADCAST_CAPPED_SIZE)
+    raise ValueError(f"Unknown broadcast backend: {name}")
+
 # WebSocket connection manager
+class ClientConnection:
+    """A meeting socket with its own bounded outbound queue and writer task"""
+
+    def __init__(self, websocket: WebSocket, queue_size: int):
+        self.websocket = websocket
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.dropped = 0
+        self.writer: Optional[asyncio.Task] = None
+        # Any message from the client, pongs included, proves the socket is alive
+        self.last_seen = time.monotonic()
+
+    async def write_loop(self, on_error):
+        try:
+            while True:
+                text = await self.queue.get()
+                await self.websocket.send_text(text)
+                self.queue.task_done()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            BROADCAST_FAILED_SENDS.labels("send_error").inc()
+            on_error(self)
+
 class ConnectionManager:
-    def __init__(self):
-        self.active_connections: Dict[str, List[WebSocket]] = {}
+    """Meeting sockets plus a sequenced, replayable event stream per meeting.
+    
+    Events are published through a broadcast backend so that every worker
+    process receives them; each worker then fans them out to the sockets it
+    holds. Every event carries a monotonically increasing `seq` and is kept in
+    a ring buffer, so a socket reconnecting with the last seq it saw only
+    receives what it missed.
+    """
 
-    async def connect(self, websocket: WebSocket, meeting_id: str):
+    def __init__(self, backend, queue_size: int = WS_SEND_QUEUE_SIZE,
+                 slow_consumer_policy: str = WS_SLOW_CONSUMER_POLICY,
+                 replay_buffer_size: int = WS_REPLAY_BUFFER_SIZE,
+                 heartbeat_interval: float = WS_HEARTBEAT_INTERVAL,
+                 heartbeat_timeout: float = WS_HEARTBEAT_TIMEOUT):
+        if slow_consumer_policy not in ("drop", "disconnect"):
+            raise ValueError(f"Unknown slow consumer policy: {slow_consumer_policy}")
+        self.backend = backend
+        self.queue_size = queue_size
+        self.slow_consumer_policy = slow_consumer_policy
+        self.replay_buffer_size = replay_buffer_size
+        self.heartbeat_interval = heartbeat_interval
+        self.heartbeat_timeout = heartbeat_timeout
+        self._heartbeat: Optional[asyncio.Task] = None
+        self.active_connections: Dict[str, Dict[WebSocket, ClientConnection]] = {}
+        self.sequences: Dict[str, int] = {}
+        self.history: Dict[str, deque] = {}
+        self.change_events: Dict[str, asyncio.Event] = {}
+        self.change_waiters: Dict[str, int] = {}
+        self.listeners: List = []
+        # Seqs restart from what this worker has seen, so versions are only comparable within one epoch
+        self.epoch = uuid.uuid4().hex[:8]
+
+    def add_listener(self, listener):
+        """Call `listener(meeting_id, message)` for every event delivered to this worker"""
+        self.listeners.append(listener)
+
+    async def start(self):
+        await self.backend.start(self.deliver)
+        self._heartbeat = asyncio.create_task(self.heartbeat_loop())
+
+    async def stop(self):
+        if self._heartbeat:
+            self._heartbeat.cancel()
+            try:
+                await self._heartbeat
+            except asyncio.CancelledError:
+                pass
+            self._heartbeat = None
+        await self.backend.stop()
+
+    def current_seq(self, meeting_id: str) -> int:
+        return self.sequences.get(meeting_id, 0)
+
+    def can_replay(self, meeting_id: str, since: int) -> bool:
+        """Whether the events after `since` are all still in the ring buffer"""
+        current = self.current_seq(meeting_id)
+        if since == current:
+            return True
+        if since > current or current - since > self.replay_buffer_size:
+            return False
+        history = self.history.get(meeting_id)
+        return bool(history) and history[0][0] <= since + 1
+
+    def events_since(self, meeting_id: str, since: int) -> Optional[List[str]]:
+        """Encoded events after `since`, or None when the ring buffer no longer covers them"""
+        if not self.can_replay(meeting_id, since):
+            return None
+        return [text for seq, text in self.history.get(meeting_id, ()) if seq > since]
+
+    async def wait_for_change(self, meeting_id: str, timeout: float):
+        """Wait until the next event of the meeting is delivered, or the timeout expires"""
+        if meeting_id not in self.change_events:
+            self.change_events[meeting_id] = asyncio.Event()
+        changed = self.change_events[meeting_id]
+        self.change_waiters[meeting_id] = self.change_waiters.get(meeting_id, 0) + 1
+        try:
+            await asyncio.wait_for(changed.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            # Drop the event of a meeting nobody waits on anymore, e.g. an unknown or deleted id
+            self.change_waiters[meeting_id] -= 1
+            if not self.change_waiters[meeting_id]:
+                del self.change_waiters[meeting_id]
+                if self.change_events.get(meeting_id) is changed:
+                    del self.change_events[meeting_id]
+
+    async def connect(self, websocket: WebSocket, meeting_id: str, since: Optional[int] = None,
+                      snapshot: Optional[dict] = None):
+        """Register a socket, first queueing the snapshot and the events after `since`"""
         await websocket.accept()
+        connection = ClientConnection(websocket, self.queue_size)
+        connection.writer = asyncio.create_task(
+            connection.write_loop(lambda conn: self.disconnect(conn.websocket, meeting_id))
+        )
         if meeting_id not in self.active_connections:
-            self.active_connections[meeting_id] = []
-        self.active_connections[meeting_id].append(websocket)
+            self.active_connections[meeting_id] = {}
+        self.active_connections[meeting_id][websocket] = connection
+        WEBSOCKET_CONNECTIONS.labels(meeting_id).inc()
+        
+        if snapshot is not None:
+            connection.queue.put_nowait(orjson.dumps(snapshot).decode())
+        if since is not None:
+            for seq, text in self.history.get(meeting_id, ()):
+                if seq > since and not connection.queue.full():
+                    connection.queue.put_nowait(text)
+        return connection
 
     def disconnect(self, websocket: WebSocket, meeting_id: str):
-        if meeting_id in self.active_connections:
-            self.active_connections[meeting_id].remove(websocket)
+        connections = self.active_connections.get(meeting_id)
+        if connections is None:
+            return
+        connection = connections.pop(websocket, None)
+        if connection:
+            WEBSOCKET_CONNECTIONS.labels(meeting_id).dec()
+        if not connections:
+            del self.active_connections[meeting_id]
+            self._forget_connection_metric(meeting_id)
+        if connection and connection.writer and connection.writer is not asyncio.current_task():
+            connection.writer.cancel()
+
+    @staticmethod
+    def _forget_connection_metric(meeting_id: str):
+        try:
+            WEBSOCKET_CONNECTIONS.remove(meeting_id)
+        except KeyError:
+            pass  # No socket of the meeting was ever counted by this worker
+
+    async def heartbeat_loop(self):
+        """Ping every socket each interval and reap those silent for longer than interval + timeout"""
+        ping = orjson.dumps({"type": "ping"}).decode()
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            deadline = time.monotonic() - self.heartbeat_interval - self.heartbeat_timeout
+            reaped = 0
+            for meeting_id, connections in list(self.active_connections.items()):
+                for connection in list(connections.values()):
+                    if connection.last_seen < deadline:
+                        reaped += 1
+                        self.disconnect(connection.websocket, meeting_id)
+                        asyncio.create_task(self._close(connection.websocket, code=1001))
+                        continue
+                    try:
+                        connection.queue.put_nowait(ping)
+                    except asyncio.QueueFull:
+                        self._handle_slow_consumer(connection, meeting_id)
+            if reaped:
+                logger.info(f"Reaped {reaped} WebSocket connections that stopped answering heartbeats")
 
     async def send_to_meeting(self, message: dict, meeting_id: str):
-        if meeting_id in self.active_connections:
-            for connection in self.active_connections[meeting_id]:
+        """Publish a message to every socket of the meeting, in every worker"""
+        await self.backend.publish(meeting_id, message)
+
+    async def deliver(self, meeting_id: str, seq: int, message: dict):
+        """Queue a published message for the local sockets without waiting on any of them"""
+        self.sequences[meeting_id] = max(seq, self.sequences.get(meeting_id, 0))
+        for listener in self.listeners:
+            try:
+                listener(meeting_id, message)
+            except Exception as e:
+                logger.error(f"Error in meeting event listener: {str(e)}")
+        
+        # Encode once for the whole meeting
+        text = orjson.dumps({**message, "seq": seq}).decode()
+        if meeting_id not in self.history:
+            self.history[meeting_id] = deque(maxlen=self.replay_buffer_size)
+        self.history[meeting_id].append((seq, text))
+        
+        # Release long-poll requests waiting on this meeting
+        changed = self.change_events.pop(meeting_id, None)
+        if changed:
+            changed.set()
+        
+        with BROADCAST_FANOUT_SECONDS.time():
+            for connection in list(self.active_connections.get(meeting_id, {}).values()):
                 try:
-                    await connection.send_text(json.dumps(message))
-                except:
-                    pass
+                    connection.queue.put_nowait(text)
+                except asyncio.QueueFull:
+                    self._handle_slow_consumer(connection, meeting_id)
+        
+        if message.get("type") == "meeting_completed":
+            self.release_meeting(meeting_id)
+
+    def release_meeting(self, meeting_id: str):
+        """Close the sockets of a deleted meeting once they have sent what is queued, and drop its state"""
+        for connection in self.active_connections.pop(meeting_id, {}).values():
+            asyncio.create_task(self._drain_and_close(connection))
+        self._forget_connection_metric(meeting_id)
+        self.sequences.pop(meeting_id, None)
+        self.history.pop(meeting_id, None)
+        changed = self.change_events.pop(meeting_id, None)
+        if changed:
+            changed.set()
+
+    async def _drain_and_close(self, connection: ClientConnection):
+        try:
+            await asyncio.wait_for(connection.queue.join(), timeout=5)
+        except asyncio.TimeoutError:
+            pass
+        if connection.writer:
+            connection.writer.cancel()
+        # 1000 tells clients the meeting is over and they should not reconnect
+        await self._close(connection.websocket, code=1000)
+
+    def _handle_slow_consumer(self, connection: ClientConnection, meeting_id: str):
+        connection.dropped += 1
+        BROADCAST_FAILED_SENDS.labels("queue_full").inc()
+        if self.slow_consumer_policy == "drop":
+            return
+        logger.warning(f"Disconnecting slow WebSocket consumer in meeting {meeting_id}")
+        self.disconnect(connection.websocket, meeting_id)
+        asyncio.create_task(self._close(connection.websocket, code=1008))
+
+    async def _close(self, websocket: WebSocket, code: int):
+        try:
+            await asyncio.wait_for(websocket.close(code=code), timeout=5)
+        except Exception:
+            pass
+
+manager = ConnectionManager(create_broadcast_backend(BROADCAST_BACKEND))
 
-manager = ConnectionManager()
 
 # Enums
 class ParticipantStatus(str, Enum):
@@ -93,15 +710,24 @@ class Participant(BaseModel):
     meeting_id: str
     approval_status: ParticipantStatus = ParticipantStatus.PENDING
     joined_at: datetime = Field(default_factory=datetime.utcnow)
+    member_code: Optional[str] = None  # Set for pre-registered roster members
 
 class ParticipantJoin(BaseModel):
     name: str
     meeting_code: str
 
+class MemberJoin(BaseModel):
+    meeting_code: str
+    member_code: str
+
 class ParticipantApproval(BaseModel):
     participant_id: str
     approved: bool
 
+class BulkParticipantApproval(BaseModel):
+    participant_ids: Optional[List[str]] = None  # None approves or rejects every pending participant
+    approved: bool
+
 class PollOption(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     text: str
@@ -133,6 +759,523 @@ class VoteCreate(BaseModel):
     poll_id: str
     option_id: str
 
+# In-memory tally engine for active polls
+class TallyEngine:
+    """Counts votes for active polls in memory and group-commits them to MongoDB.
+    
+    Active polls are cached with their option ids so a ballot can be validated
+    and counted without touching the database. Concurrent votes are queued and
+    a single consumer writes them with one insert_many, every `flush_interval`
+    seconds or as soon as `max_batch` votes are waiting. Each submitter is
+    acknowledged once the batch holding its vote is durable.
+    
+    A poll closed by another worker stays cached here until its poll_closed
+    event arrives, so each batch re-checks the status of its polls and only
+    counts votes into a poll that is still active; late ballots are refused.
+    """
+
+    def __init__(self, flush_interval: float, max_batch: int):
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.active_polls: Dict[str, dict] = {}
+        # Polls being closed: they take no new ballots while their last votes are flushed
+        self.closing: set = set()
+        self.pending: List[tuple] = []
+        self.pending_counts: Dict[str, Dict[str, int]] = {}
+        self.batches_written = 0
+        self.votes_written = 0
+        self.last_batch_size = 0
+        self.max_batch_seen = 0
+        self._flush_lock = asyncio.Lock()
+        self._has_votes: Optional[asyncio.Event] = None
+        self._batch_full: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def get_poll(self, poll_id: str) -> Optional[dict]:
+        """Return the cached poll, loading it from the database on a miss"""
+        cached = self.active_polls.get(poll_id)
+        if cached:
+            return cached["poll"]
+        
+        # Miss: the poll is not active, or was started by another worker
+        poll = await db.polls.find_one({"id": poll_id}, POLL_FIELDS)
+        if poll and poll["status"] == PollStatus.ACTIVE and poll_id not in self.closing:
+            self.cache_poll(poll)
+        return poll
+
+    def cache_poll(self, poll: dict):
+        """Cache an active poll with an option id index for O(1) vote validation"""
+        self.active_polls[poll["id"]] = {
+            "poll": poll,
+            "option_index": {opt["id"]: i for i, opt in enumerate(poll["options"])}
+        }
+
+    def on_meeting_event(self, meeting_id: str, message: dict):
+        """Keep the cache coherent with poll changes made by any worker"""
+        if message.get("type") == "poll_closed":
+            # Polls started elsewhere are loaded on their first vote, but a close must stop votes here too
+            self.evict(message["poll_id"])
+        elif message.get("type") == "meeting_completed":
+            for poll_id in [pid for pid, cached in self.active_polls.items()
+                            if cached["poll"]["meeting_id"] == meeting_id]:
+                self.evict(poll_id)
+
+    def is_valid_option(self, poll_id: str, option_id: str) -> bool:
+        cached = self.active_polls.get(poll_id)
+        return bool(cached) and option_id in cached["option_index"]
+
+    def evict(self, poll_id: str):
+        self.active_polls.pop(poll_id, None)
+
+    def accepts_votes(self, poll_id: str) -> bool:
+        return poll_id in self.active_polls and poll_id not in self.closing
+
+    def begin_close(self, poll_id: str):
+        """Refuse new ballots for the poll; votes already queued are still written by the next flush"""
+        self.closing.add(poll_id)
+
+    def end_close(self, poll_id: str):
+        self.evict(poll_id)
+        self.closing.discard(poll_id)
+
+    async def submit(self, vote: Vote) -> dict:
+        """Count a validated vote and wait until the batch holding it is durable"""
+        # Checked again here, without awaiting in between, as the poll may have started closing
+        # while the request was validating it
+        if not self.accepts_votes(vote.poll_id):
+            raise HTTPException(status_code=400, detail="Poll is not active")
+        cached = self.active_polls[vote.poll_id]
+        self._add_to_count(vote.poll_id, vote.option_id, 1)
+        counts = self.pending_counts.setdefault(vote.poll_id, {})
+        counts[vote.option_id] = counts.get(vote.option_id, 0) + 1
+        
+        written = asyncio.get_running_loop().create_future()
+        self.pending.append((vote.dict(), written))
+        if self._has_votes:
+            self._has_votes.set()
+            if len(self.pending) >= self.max_batch:
+                self._batch_full.set()
+        else:
+            # No consumer running (e.g. before startup), commit inline
+            await self.flush()
+        
+        waiting = time.perf_counter()
+        await written
+        timings = request_timings.get()
+        if timings:
+            timings.add_wait("vote-batch", time.perf_counter() - waiting)
+        return cached["poll"]
+
+    def _add_to_count(self, poll_id: str, option_id: str, delta: int):
+        cached = self.active_polls.get(poll_id)
+        if cached and option_id in cached["option_index"]:
+            cached["poll"]["options"][cached["option_index"][option_id]]["votes"] += delta
+
+    def stats(self) -> dict:
+        return {
+            "queue_depth": len(self.pending),
+            "last_batch_size": self.last_batch_size,
+            "max_batch_size": self.max_batch_seen,
+            "average_batch_size": round(self.votes_written / self.batches_written, 1) if self.batches_written else 0,
+            "batches_written": self.batches_written,
+            "votes_written": self.votes_written,
+            "flush_interval": self.flush_interval,
+            "max_batch": self.max_batch,
+            "active_polls": len(self.active_polls)
+        }
+
+    async def flush(self):
+        """Write every queued vote to the database and acknowledge its submitter"""
+        async with self._flush_lock:
+            if not self.pending:
+                return
+            batch, self.pending = self.pending, []
+            self.pending_counts = {}
+            
+            # Ballot indexes that failed to write, and those for a poll that is no longer active
+            failed = set()
+            closed = set()
+            try:
+                # Another worker may have closed a poll before its poll_closed event reached this one
+                active = await self._active_poll_ids({doc["poll_id"] for doc, _ in batch})
+                closed = {index for index, (doc, _) in enumerate(batch) if doc["poll_id"] not in active}
+                to_write = [index for index in range(len(batch)) if index not in closed]
+                if to_write:
+                    await db.votes.insert_many([batch[index][0] for index in to_write], ordered=False)
+            except BulkWriteError as e:
+                failed = {to_write[error["index"]] for error in e.details.get("writeErrors", [])}
+                logger.error(f"{len(failed)} of {len(batch)} votes failed to write: {str(e)}")
+            except Exception as e:
+                failed = set(range(len(batch))) - closed
+                logger.error(f"Error writing batch of {len(batch)} votes: {str(e)}")
+            
+            written_by_poll: Dict[str, List[int]] = {}
+            for index, (doc, _) in enumerate(batch):
+                if index not in failed and index not in closed:
+                    written_by_poll.setdefault(doc["poll_id"], []).append(index)
+            
+            # The votes themselves are durable now; a failed counter update is
+            # repaired by the reconciliation recount and must not fail the ballot
+            for poll_id, indexes in written_by_poll.items():
+                poll_counts: Dict[str, int] = {}
+                for index in indexes:
+                    option_id = batch[index][0]["option_id"]
+                    poll_counts[option_id] = poll_counts.get(option_id, 0) + 1
+                try:
+                    if not await self._apply_counts(poll_id, poll_counts):
+                        # Closed between the status check and the write: take the ballots back
+                        await db.votes.delete_many({"id": {"$in": [batch[index][0]["id"] for index in indexes]}})
+                        closed.update(indexes)
+                except Exception as e:
+                    logger.error(f"Error updating tally for poll {poll_id}: {str(e)}")
+            
+            for index, (doc, written) in enumerate(batch):
+                if index in failed or index in closed:
+                    self._add_to_count(doc["poll_id"], doc["option_id"], -1)
+                if index in closed:
+                    self.evict(doc["poll_id"])
+                if written.done():
+                    continue
+                if index in closed:
+                    written.set_exception(HTTPException(status_code=400, detail="Poll is not active"))
+                elif index in failed:
+                    written.set_exception(HTTPException(status_code=500, detail="Vote could not be recorded"))
+                else:
+                    written.set_result(None)
+            
+            written_count = len(batch) - len(failed) - len(closed)
+            self.batches_written += 1
+            self.votes_written += written_count
+            self.last_batch_size = len(batch)
+            self.max_batch_seen = max(self.max_batch_seen, len(batch))
+            logger.debug(f"Wrote batch of {written_count} votes, {len(self.pending)} queued")
+
+    async def _active_poll_ids(self, poll_ids: set) -> set:
+        polls = db.polls.find({"id": {"$in": list(poll_ids)}, "status": PollStatus.ACTIVE}, {"_id": 0, "id": 1})
+        return {poll["id"] async for poll in polls}
+
+    async def _apply_counts(self, poll_id: str, counts: Dict[str, int]) -> bool:
+        """Add the counts to the poll's counters, False when the poll is no longer active"""
+        cached = self.active_polls.get(poll_id)
+        if cached:
+            option_index = cached["option_index"]
+        else:
+            poll = await db.polls.find_one({"id": poll_id}, {"options.id": 1})
+            option_index = {opt["id"]: i for i, opt in enumerate(poll["options"])} if poll else {}
+        
+        increments = {
+            f"options.{option_index[option_id]}.votes": count
+            for option_id, count in counts.items() if option_id in option_index
+        }
+        if not increments:
+            return True
+        updated_poll = await db.polls.find_one_and_update(
+            {"id": poll_id, "status": PollStatus.ACTIVE},
+            {"$inc": increments},
+            projection={"_id": 0, "options": 1},
+            return_document=ReturnDocument.AFTER
+        )
+        if not updated_poll:
+            return False
+        
+        # Resync the cached counters with the database plus what is still queued
+        cached = self.active_polls.get(poll_id)
+        if cached:
+            still_pending = self.pending_counts.get(poll_id, {})
+            for option, stored in zip(cached["poll"]["options"], updated_poll["options"]):
+                option["votes"] = stored["votes"] + still_pending.get(option["id"], 0)
+        return True
+
+    async def run(self):
+        while True:
+            await self._has_votes.wait()
+            # Let concurrent requests join the batch until it is full or the interval ends
+            try:
+                await asyncio.wait_for(self._batch_full.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._has_votes.clear()
+            self._batch_full.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Unexpected error in vote flush: {str(e)}")
+
+    def start(self):
+        self._has_votes = asyncio.Event()
+        self._batch_full = asyncio.Event()
+        self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            self._has_votes = None
+            self._batch_full = None
+        await self.flush()
+
+tally_engine = TallyEngine(TALLY_FLUSH_INTERVAL, TALLY_MAX_BATCH)
+manager.add_listener(tally_engine.on_meeting_event)
+
+class VoteBroadcastCoalescer:
+    """Sends at most one vote_submitted tally per poll per window, across all workers.
+    
+    Votes only mark their poll as changed. When the window ends, the worker
+    claims the poll's broadcast slot in the database and reads the counts in the
+    same atomic update, so every worker sees the same durable counts and only
+    one of them broadcasts per window. A worker that loses the claim tries again
+    in the next window, since its votes may be newer than the winner's read.
+    """
+
+    def __init__(self, window: float):
+        self.window = window
+        self.scheduled: Dict[str, asyncio.Task] = {}
+
+    def notify(self, poll_id: str, meeting_id: str):
+        if poll_id not in self.scheduled:
+            # Started from a vote request, but must not be timed as part of it
+            self.scheduled[poll_id] = asyncio.create_task(
+                self._broadcast_later(poll_id, meeting_id), context=Context()
+            )
+
+    async def _broadcast_later(self, poll_id: str, meeting_id: str):
+        try:
+            await asyncio.sleep(self.window)
+        finally:
+            self.scheduled.pop(poll_id, None)
+        
+        now = datetime.utcnow()
+        poll = await db.polls.find_one_and_update(
+            {"id": poll_id, "$or": [
+                {"tally_broadcast_at": {"$exists": False}},
+                {"tally_broadcast_at": {"$lte": now - timedelta(seconds=self.window)}}
+            ]},
+            {"$set": {"tally_broadcast_at": now}},
+            projection={"_id": 0, "options.votes": 1}
+        )
+        if poll is None:
+            # Another worker broadcast this window; retry unless the poll is gone
+            if await db.polls.count_documents({"id": poll_id}, limit=1):
+                self.notify(poll_id, meeting_id)
+            return
+        
+        # Compact delta: counts follow the order of the poll's options
+        await manager.send_to_meeting({
+            "type": "vote_submitted",
+            "poll_id": poll_id,
+            "counts": [opt["votes"] for opt in poll["options"]]
+        }, meeting_id)
+
+    def stop(self):
+        for task in self.scheduled.values():
+            task.cancel()
+        self.scheduled.clear()
+
+vote_broadcaster = VoteBroadcastCoalescer(VOTE_BROADCAST_WINDOW)
+
+def poll_deadline(poll: dict) -> Optional[datetime]:
+    """When a timed poll stops accepting votes, None for polls without a running timer"""
+    if not poll.get("timer_duration") or not poll.get("timer_started_at"):
+        return None
+    return poll["timer_started_at"] + timedelta(seconds=poll["timer_duration"])
+
+class PollTimerScheduler:
+    """Closes timed polls at their deadline.
+    
+    Deadlines of every timed poll sit in one heap and a single task sleeps until
+    the earliest one, so thousands of running timers cost one sleeping task.
+    A poll closed or deleted before its deadline is only dropped from the
+    `deadlines` index; its heap entry is skipped when it comes up.
+    """
+
+    def __init__(self):
+        self.heap: List[tuple] = []
+        self.deadlines: Dict[str, tuple] = {}
+        self.closing: set = set()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def schedule(self, poll_id: str, meeting_id: str, deadline: datetime):
+        self.deadlines[poll_id] = (deadline, meeting_id)
+        heapq.heappush(self.heap, (deadline, poll_id))
+        # Only a new earliest deadline shortens the current sleep
+        if self._wakeup and self.heap[0][1] == poll_id:
+            self._wakeup.set()
+
+    def cancel(self, poll_id: str):
+        self.deadlines.pop(poll_id, None)
+
+    def on_meeting_event(self, meeting_id: str, message: dict):
+        """Forget the timers of polls closed or deleted by any worker"""
+        if message.get("type") == "poll_closed":
+            self.cancel(message["poll_id"])
+        elif message.get("type") == "meeting_completed":
+            for poll_id in [pid for pid, (_, mid) in self.deadlines.items() if mid == meeting_id]:
+                self.cancel(poll_id)
+
+    async def load(self):
+        """Reschedule the timers of polls still active in the database, e.g. after a restart"""
+        async for poll in db.polls.find(
+            {"status": PollStatus.ACTIVE, "timer_duration": {"$gt": 0}, "timer_started_at": {"$ne": None}},
+            {"_id": 0, "id": 1, "meeting_id": 1, "timer_duration": 1, "timer_started_at": 1}
+        ):
+            self.schedule(poll["id"], poll["meeting_id"], poll_deadline(poll))
+        logger.info(f"Poll timers loaded: {len(self.deadlines)} pending")
+
+    async def run(self):
+        while True:
+            if not self.heap:
+                await self._wakeup.wait()
+                self._wakeup.clear()
+                continue
+            
+            deadline, poll_id = self.heap[0]
+            delay = (deadline - datetime.utcnow()).total_seconds()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+                continue
+            
+            heapq.heappop(self.heap)
+            scheduled = self.deadlines.get(poll_id)
+            if not scheduled or scheduled[0] != deadline:
+                continue  # Cancelled or rescheduled since
+            del self.deadlines[poll_id]
+            # Close in the background so polls expiring together do not delay each other
+            task = asyncio.create_task(self._close(poll_id, scheduled[1]))
+            self.closing.add(task)
+            task.add_done_callback(self.closing.discard)
+
+    async def _close(self, poll_id: str, meeting_id: str):
+        try:
+            if await close_poll_and_notify(poll_id, meeting_id, only_if_active=True):
+                logger.info(f"Poll {poll_id} closed at its deadline")
+        except Exception as e:
+            logger.error(f"Error closing expired poll {poll_id}: {str(e)}")
+
+    def start(self):
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            self._wakeup = None
+        for task in list(self.closing):
+            task.cancel()
+
+poll_scheduler = PollTimerScheduler()
+manager.add_listener(poll_scheduler.on_meeting_event)
+
+# Projections fetching exactly the fields of the API models, so documents can be
+# encoded as they come from MongoDB instead of being re-validated by Pydantic
+MEETING_FIELDS = {"_id": 0, "id": 1, "title": 1, "organizer_name": 1, "meeting_code": 1, "status": 1,
+                  "created_at": 1}
+PARTICIPANT_FIELDS = {"_id": 0, "id": 1, "name": 1, "meeting_id": 1, "approval_status": 1, "joined_at": 1}
+POLL_FIELDS = {"_id": 0, "id": 1, "meeting_id": 1, "question": 1, "options": 1, "status": 1,
+               "timer_duration": 1, "timer_started_at": 1, "created_at": 1}
+
+def encode_json(content: Any) -> bytes:
+    """Encode documents with orjson, which handles datetimes and enums natively"""
+    return orjson.dumps(content)
+
+def json_response(content: Any) -> Response:
+    """JSON response that bypasses FastAPI's jsonable_encoder pass"""
+    return Response(content=encode_json(content), media_type="application/json")
+
+async def iter_json_array(cursor, chunk_items: int = 100):
+    """Encode the documents of a cursor as a JSON array, a few at a time, without materializing it"""
+    yield b"["
+    chunk = []
+    first = True
+    async for doc in cursor:
+        chunk.append(encode_json(doc))
+        if len(chunk) >= chunk_items:
+            yield (b"" if first else b",") + b",".join(chunk)
+            first = False
+            chunk = []
+    if chunk:
+        yield (b"" if first else b",") + b",".join(chunk)
+    yield b"]"
+
+class TTLCache:
+    """Size-bounded LRU cache whose entries expire `ttl` seconds after being stored"""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.entries: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self.entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key, value):
+        self.entries[key] = (time.monotonic() + self.ttl, value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key):
+        self.entries.pop(key, None)
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations
+        }
+
+meeting_code_cache = TTLCache(MEETING_CACHE_SIZE, MEETING_CACHE_TTL)
+
+def invalidate_completed_meeting(meeting_id: str, message: dict):
+    if message.get("type") == "meeting_completed":
+        meeting_code_cache.invalidate(message["meeting_code"])
+
+manager.add_listener(invalidate_completed_meeting)
+
+async def find_active_meeting(meeting_code: str) -> Optional[dict]:
+    """Active meeting for a code, served from the cache when a room joins all at once.
+    
+    The returned document is shared with the cache and must not be modified.
+    """
+    meeting = meeting_code_cache.get(meeting_code)
+    if meeting is None:
+        meeting = await db.meetings.find_one({"meeting_code": meeting_code, "status": "active"}, MEETING_FIELDS)
+        if meeting:
+            meeting_code_cache.set(meeting_code, meeting)
+    return meeting
+
 # Meeting endpoints
 @api_router.post("/meetings", response_model=Meeting)
 async def create_meeting(meeting_data: MeetingCreate):
@@ -142,56 +1285,74 @@ async def create_meeting(meeting_data: MeetingCreate):
 
 @api_router.get("/meetings/{meeting_code}")
 async def get_meeting_by_code(meeting_code: str):
-    meeting = await db.meetings.find_one({"meeting_code": meeting_code, "status": "active"})
+    meeting = await find_active_meeting(meeting_code)
     if not meeting:
         raise HTTPException(status_code=404, detail="Meeting not found")
-    return Meeting(**meeting)
+    return json_response(meeting)
 
 @api_router.get("/meetings/{meeting_id}/organizer")
 async def get_meeting_organizer_view(meeting_id: str):
-    meeting = await db.meetings.find_one({"id": meeting_id})
+    meeting = await db.meetings.find_one({"id": meeting_id}, MEETING_FIELDS)
     if not meeting:
         raise HTTPException(status_code=404, detail="Meeting not found")
     
-    # Get participants
-    participants = await db.participants.find({"meeting_id": meeting_id}).to_list(1000)
-    
-    # Get polls
-    polls = await db.polls.find({"meeting_id": meeting_id}).to_list(1000)
+    async def body():
+        yield b'{"meeting": ' + encode_json(meeting)
+        
+        # Participants and polls are streamed from their cursors, so memory stays bounded
+        yield b', "participants": '
+        # Only the organizer sees the member codes of imported participants
+        participants = db.participants.find({"meeting_id": meeting_id}, {**PARTICIPANT_FIELDS, "member_code": 1},
+                                            batch_size=CURSOR_BATCH_SIZE)
+        async for chunk in iter_json_array(participants):
+            yield chunk
+        
+        yield b', "polls": '
+        polls = db.polls.find({"meeting_id": meeting_id}, POLL_FIELDS, batch_size=CURSOR_BATCH_SIZE)
+        async for chunk in iter_json_array(polls):
+            yield chunk
+        yield b"}"
     
-    return {
-        "meeting": Meeting(**meeting),
-        "participants": [Participant(**p) for p in participants],
-        "polls": [Poll(**poll) for poll in polls]
-    }
+    return StreamingResponse(body(), media_type="application/json")
 
 # Participant endpoints
 @api_router.post("/participants/join")
 async def join_meeting(join_data: ParticipantJoin):
     # Check if meeting exists and is active
-    meeting = await db.meetings.find_one({"meeting_code": join_data.meeting_code, "status": "active"})
+    meeting = await find_active_meeting(join_data.meeting_code)
     if not meeting:
         raise HTTPException(status_code=404, detail="Meeting not found or not active")
     
-    # Check if participant name already exists in this meeting
-    existing = await db.participants.find_one({
-        "name": join_data.name, 
-        "meeting_id": meeting["id"]
-    })
-    if existing:
-        raise HTTPException(status_code=400, detail="Name already taken in this meeting")
-    
+    # The unique (meeting_id, name) index rejects names already taken in this meeting
     participant = Participant(name=join_data.name, meeting_id=meeting["id"])
-    await db.participants.insert_one(participant.dict())
+    try:
+        await db.participants.insert_one(participant.dict())
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail="Name already taken in this meeting")
     
-    # Notify organizer via WebSocket
+    # Notify organizer via WebSocket; events carry ids only, clients fetch names themselves
     await manager.send_to_meeting({
         "type": "participant_joined",
-        "participant": participant.dict()
+        "participant_id": participant.id
     }, meeting["id"])
     
     return participant
 
+@api_router.post("/participants/join-member")
+async def join_meeting_as_member(join_data: MemberJoin):
+    """Join with the code handed out by a roster import; members are already approved"""
+    meeting = await find_active_meeting(join_data.meeting_code)
+    if not meeting:
+        raise HTTPException(status_code=404, detail="Meeting not found or not active")
+    
+    participant = await db.participants.find_one(
+        {"meeting_id": meeting["id"], "member_code": join_data.member_code.upper()},
+        {"_id": 0}
+    )
+    if not participant:
+        raise HTTPException(status_code=404, detail="Unknown member code")
+    return Participant(**participant)
+
 @api_router.post("/participants/{participant_id}/approve")
 async def approve_participant(participant_id: str, approval: ParticipantApproval):
     participant = await db.participants.find_one({"id": participant_id})
@@ -213,12 +1374,232 @@ async def approve_participant(participant_id: str, approval: ParticipantApproval
     
     return {"status": "success"}
 
+@api_router.post("/meetings/{meeting_id}/participants/approve")
+async def approve_participants(meeting_id: str, approval: BulkParticipantApproval):
+    """Approve or reject many participants with one update and one notification"""
+    if approval.participant_ids is None:
+        pending = db.participants.find(
+            {"meeting_id": meeting_id, "approval_status": ParticipantStatus.PENDING},
+            {"_id": 0, "id": 1},
+            batch_size=CURSOR_BATCH_SIZE
+        )
+        participant_ids = [p["id"] async for p in pending]
+    else:
+        participant_ids = approval.participant_ids
+    
+    if not participant_ids:
+        return {"status": "success", "updated": 0}
+    
+    new_status = ParticipantStatus.APPROVED if approval.approved else ParticipantStatus.REJECTED
+    result = await db.participants.update_many(
+        {"meeting_id": meeting_id, "id": {"$in": participant_ids}},
+        {"$set": {"approval_status": new_status}}
+    )
+    
+    # Notify via WebSocket, once for the whole batch
+    await manager.send_to_meeting({
+        "type": "participants_approved",
+        "participant_ids": participant_ids,
+        "status": new_status
+    }, meeting_id)
+    
+    return {"status": "success", "updated": result.modified_count}
+
+MEMBER_CODE_ALPHABET = "ABCDEFGHJKLMNPQRSTUVWXYZ23456789"
+
+def generate_member_code() -> str:
+    return "".join(secrets.choice(MEMBER_CODE_ALPHABET) for _ in range(8))
+
+# Roster CSV header cells naming the participant, and the optional first-name column joined to it
+ROSTER_NAME_HEADERS = ("name", "nom", "full name", "nom complet")
+ROSTER_FIRST_NAME_HEADERS = ("first name", "first_name", "prénom", "prenom")
+
+def roster_name_columns(row: List[str]) -> Optional[List[int]]:
+    """Indexes of the name columns when the row is a header row, otherwise None"""
+    header = [cell.strip().lower() for cell in row]
+    name = next((i for i, cell in enumerate(header) if cell in ROSTER_NAME_HEADERS), None)
+    if name is None:
+        return None
+    first_name = next((i for i, cell in enumerate(header) if cell in ROSTER_FIRST_NAME_HEADERS), None)
+    return [first_name, name] if first_name is not None else [name]
+
+def sniff_delimiter(lines: List[str]) -> str:
+    """Comma, semicolon (French spreadsheet exports) or tab, from the first lines of a CSV"""
+    try:
+        return csv.Sniffer().sniff("\n".join(lines[:20]), delimiters=",;\t").delimiter
+    except csv.Error:
+        return ","  # A single column has nothing to sniff
+
+async def iter_roster_names(request: Request):
+    """Names from a roster body: a JSON list (of names or {"name": ...}) or a streamed CSV"""
+    if "json" in request.headers.get("content-type", ""):
+        try:
+            roster = await request.json()
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid JSON roster")
+        if not isinstance(roster, list):
+            raise HTTPException(status_code=400, detail="Roster must be a list")
+        # Validate the whole roster before anything is imported
+        names = []
+        for position, entry in enumerate(roster):
+            if isinstance(entry, dict) and isinstance(entry.get("name"), str):
+                names.append(entry["name"])
+            elif isinstance(entry, str):
+                names.append(entry)
+            else:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Invalid roster entry at position {position}: expected a name or {{\"name\": ...}}"
+                )
+        for name in names:
+            yield name
+        return
+    
+    # CSV: the name column (with the first-name column before it, if any) when there is a
+    # header row, the first column otherwise
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    buffer = ""
+    delimiter = None
+    columns = None
+    
+    def names_from(lines: List[str]):
+        nonlocal delimiter, columns
+        if delimiter is None:
+            delimiter = sniff_delimiter(lines)
+        for row in csv.reader(lines, delimiter=delimiter):
+            if not row:
+                continue
+            if columns is None:
+                columns = roster_name_columns(row)
+                if columns is not None:
+                    continue
+                columns = [0]
+            yield " ".join(row[i].strip() for i in columns if i < len(row))
+    
+    async for chunk in request.stream():
+        buffer += decoder.decode(chunk)
+        *lines, buffer = buffer.split("\n")
+        if lines:
+            for name in names_from(lines):
+                yield name
+    buffer += decoder.decode(b"", final=True)
+    if buffer.strip():
+        for name in names_from([buffer]):
+            yield name
+
+@api_router.post("/meetings/{meeting_id}/participants/import")
+async def import_participants(meeting_id: str, request: Request):
+    """Pre-register a roster (CSV or JSON) as approved participants, each with a member code"""
+    meeting = await db.meetings.find_one({"id": meeting_id}, {"_id": 0, "id": 1})
+    if not meeting:
+        raise HTTPException(status_code=404, detail="Meeting not found")
+    
+    # Names and codes already used in this meeting, checked in memory before inserting
+    taken_names = set()
+    taken_codes = set()
+    async for existing in db.participants.find({"meeting_id": meeting_id}, {"_id": 0, "name": 1, "member_code": 1},
+                                               batch_size=CURSOR_BATCH_SIZE):
+        taken_names.add(existing["name"])
+        if existing.get("member_code"):
+            taken_codes.add(existing["member_code"])
+    
+    members = []
+    duplicates = []
+    batch = []
+    
+    async def write_batch():
+        try:
+            await db.participants.insert_many([p.dict() for p in batch], ordered=False)
+            failed = set()
+        except BulkWriteError as e:
+            # Someone joined with the same name while the roster was importing
+            failed = {error["index"] for error in e.details.get("writeErrors", [])}
+        for index, participant in enumerate(batch):
+            if index in failed:
+                duplicates.append(participant.name)
+            else:
+                members.append({"id": participant.id, "name": participant.name, "member_code": participant.member_code})
+        batch.clear()
+    
+    async for raw_name in iter_roster_names(request):
+        name = raw_name.strip()
+        if not name:
+            continue
+        if name in taken_names:
+            duplicates.append(name)
+            continue
+        taken_names.add(name)
+        
+        member_code = generate_member_code()
+        while member_code in taken_codes:
+            member_code = generate_member_code()
+        taken_codes.add(member_code)
+        
+        batch.append(Participant(
+            name=name,
+            meeting_id=meeting_id,
+            approval_status=ParticipantStatus.APPROVED,
+            member_code=member_code
+        ))
+        if len(batch) >= ROSTER_IMPORT_BATCH_SIZE:
+            await write_batch()
+    if batch:
+        await write_batch()
+    
+    if members:
+        await manager.send_to_meeting({
+            "type": "participants_imported",
+            "count": len(members)
+        }, meeting_id)
+    
+    return {"imported": len(members), "duplicates": duplicates, "members": members}
+
 @api_router.get("/participants/{participant_id}/status")
 async def get_participant_status(participant_id: str):
-    participant = await db.participants.find_one({"id": participant_id})
+    participant = await db.participants.find_one({"id": participant_id}, {"_id": 0, "approval_status": 1})
+    if not participant:
+        raise HTTPException(status_code=404, detail="Participant not found")
+    return json_response({"status": participant["approval_status"]})
+
+@api_router.get("/meetings/{meeting_id}/participants/{participant_id}/snapshot")
+async def get_participant_snapshot(meeting_id: str, participant_id: str, request: Request):
+    """Approval status and active polls of a participant in one call.
+    
+    The ETag is the meeting's event version: every change a participant can
+    see (approval, poll start and close, tallies) is a meeting event, so an
+    unchanged version is answered with 304 without querying MongoDB. It is
+    weak because tallies are broadcast at most once per window while the
+    counts served here move with every vote, so two bodies with the same
+    version may differ by the votes of one window.
+    """
+    # Taken before reading, so a change landing mid-read is picked up by the next call
+    version = manager.current_seq(meeting_id)
+    etag = f'W/"{manager.epoch}-{version}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+    
+    participant = await db.participants.find_one(
+        {"id": participant_id, "meeting_id": meeting_id}, {"_id": 0, "approval_status": 1}
+    )
     if not participant:
         raise HTTPException(status_code=404, detail="Participant not found")
-    return {"status": participant["approval_status"]}
+    
+    polls = [poll async for poll in db.polls.find(
+        {"meeting_id": meeting_id, "status": PollStatus.ACTIVE}, POLL_FIELDS, batch_size=CURSOR_BATCH_SIZE
+    )]
+    # Active polls have fresher counts in the tally engine than in the database
+    for i, poll in enumerate(polls):
+        cached = tally_engine.active_polls.get(poll["id"])
+        if cached:
+            polls[i] = cached["poll"]
+    
+    return Response(
+        content=encode_json({"version": version, "status": participant["approval_status"], "polls": polls}),
+        media_type="application/json",
+        headers=headers
+    )
 
 # Poll endpoints
 @api_router.post("/meetings/{meeting_id}/polls", response_model=Poll)
@@ -241,7 +1622,7 @@ async def create_poll(meeting_id: str, poll_data: PollCreate):
 
 @api_router.post("/polls/{poll_id}/start")
 async def start_poll(poll_id: str):
-    poll = await db.polls.find_one({"id": poll_id})
+    poll = await db.polls.find_one({"id": poll_id}, POLL_FIELDS)
     if not poll:
         raise HTTPException(status_code=404, detail="Poll not found")
     
@@ -258,89 +1639,166 @@ async def start_poll(poll_id: str):
         "poll_id": poll_id
     }, poll["meeting_id"])
     
+    # Votes on this poll are validated from memory from now on
+    poll.pop("_id", None)
+    poll.update(update_data)
+    tally_engine.cache_poll(poll)
+    
+    # Timed polls are closed by the server at their deadline
+    deadline = poll_deadline(poll)
+    if deadline:
+        poll_scheduler.schedule(poll_id, poll["meeting_id"], deadline)
+    
     return {"status": "started"}
 
-@api_router.post("/polls/{poll_id}/close")
-async def close_poll(poll_id: str):
-    poll = await db.polls.find_one({"id": poll_id})
-    if not poll:
-        raise HTTPException(status_code=404, detail="Poll not found")
+async def close_poll_and_notify(poll_id: str, meeting_id: str, only_if_active: bool = False) -> bool:
+    """Close a poll after its final tally flush and announce it; shared by the endpoint and the timers.
+    
+    With `only_if_active`, a poll that is no longer active (closed by the
+    organizer or by another worker's timer) is left alone and False is returned.
+    """
+    poll_scheduler.cancel(poll_id)
     
-    await db.polls.update_one({"id": poll_id}, {"$set": {"status": PollStatus.CLOSED}})
+    # Stop taking ballots first, so none can be queued after the final flush
+    tally_engine.begin_close(poll_id)
+    try:
+        # Persist the votes queued before the close while the poll still counts them;
+        # the lock also waits for a flush in progress
+        await tally_engine.flush()
+        
+        # Flushes of other workers check the status, so their late ballots are refused from here on
+        query = {"id": poll_id}
+        if only_if_active:
+            query["status"] = PollStatus.ACTIVE
+        result = await db.polls.update_one(query, {"$set": {"status": PollStatus.CLOSED}})
+        if only_if_active and not result.matched_count:
+            return False
+    finally:
+        tally_engine.end_close(poll_id)
     
     # Notify participants
     await manager.send_to_meeting({
         "type": "poll_closed",
         "poll_id": poll_id
-    }, poll["meeting_id"])
+    }, meeting_id)
+    return True
+
+@api_router.post("/polls/{poll_id}/close")
+async def close_poll(poll_id: str):
+    poll = await db.polls.find_one({"id": poll_id}, {"_id": 0, "meeting_id": 1})
+    if not poll:
+        raise HTTPException(status_code=404, detail="Poll not found")
+    
+    await close_poll_and_notify(poll_id, poll["meeting_id"])
     
     return {"status": "closed"}
 
+@api_router.get("/meetings/{meeting_id}/wait")
+async def wait_for_meeting_change(meeting_id: str, version: int = 0, timeout: float = 25):
+    """Long-poll: answer as soon as the meeting moves past `version`, or when the timeout expires.
+    
+    The response carries the current version and the events missed since
+    `version`, or null events when the client has to reload the whole state.
+    """
+    timeout = min(max(timeout, 0), LONG_POLL_MAX_TIMEOUT)
+    if manager.current_seq(meeting_id) == version:
+        await manager.wait_for_change(meeting_id, timeout)
+    
+    current = manager.current_seq(meeting_id)
+    events = manager.events_since(meeting_id, version)
+    # Events are already JSON encoded in the ring buffer
+    encoded_events = "null" if events is None else "[" + ",".join(events) + "]"
+    return Response(
+        content=f'{{"version": {current}, "events": {encoded_events}}}',
+        media_type="application/json"
+    )
+
 @api_router.get("/meetings/{meeting_id}/polls")
 async def get_meeting_polls(meeting_id: str):
-    polls = await db.polls.find({"meeting_id": meeting_id}).to_list(1000)
-    return [Poll(**poll) for poll in polls]
+    polls = db.polls.find({"meeting_id": meeting_id}, POLL_FIELDS, batch_size=CURSOR_BATCH_SIZE)
+    return StreamingResponse(iter_json_array(polls), media_type="application/json")
 
 # Voting endpoints
 @api_router.post("/votes")
 async def submit_vote(vote_data: VoteCreate):
     # Verify poll exists and is active
-    poll = await db.polls.find_one({"id": vote_data.poll_id})
+    poll = await tally_engine.get_poll(vote_data.poll_id)
     if not poll:
         raise HTTPException(status_code=404, detail="Poll not found")
     
     if poll["status"] != PollStatus.ACTIVE:
         raise HTTPException(status_code=400, detail="Poll is not active")
     
+    # The timer may have run out before the scheduler got to close the poll
+    deadline = poll_deadline(poll)
+    if deadline and datetime.utcnow() >= deadline:
+        raise HTTPException(status_code=400, detail="Poll is not active")
+    
     # Check if option exists
-    option_exists = any(opt["id"] == vote_data.option_id for opt in poll["options"])
-    if not option_exists:
+    if not tally_engine.is_valid_option(vote_data.poll_id, vote_data.option_id):
         raise HTTPException(status_code=400, detail="Invalid option")
     
-    # Create anonymous vote
+    # Create anonymous vote, acknowledged once its batch is written
     vote = Vote(poll_id=vote_data.poll_id, option_id=vote_data.option_id)
-    await db.votes.insert_one(vote.dict())
-    
-    # Update poll results
-    await update_poll_results(vote_data.poll_id)
+    await tally_engine.submit(vote)
+    VOTES_RECORDED.labels(vote_data.poll_id).inc()
     
-    # Notify real-time updates
-    updated_poll = await db.polls.find_one({"id": vote_data.poll_id})
-    await manager.send_to_meeting({
-        "type": "vote_submitted",
-        "poll": Poll(**updated_poll).dict()
-    }, poll["meeting_id"])
+    # Notify real-time updates, coalesced per poll and sent in the background
+    vote_broadcaster.notify(vote_data.poll_id, poll["meeting_id"])
     
     return {"status": "vote_submitted"}
 
-async def update_poll_results(poll_id: str):
-    # Get all votes for this poll
-    votes = await db.votes.find({"poll_id": poll_id}).to_list(1000)
-    vote_counts = {}
-    
-    for vote in votes:
-        option_id = vote["option_id"]
-        vote_counts[option_id] = vote_counts.get(option_id, 0) + 1
+async def count_votes(poll_ids: List[str]) -> Dict[str, Dict[str, int]]:
+    """Recount the votes of several polls in a single aggregation: poll_id -> option_id -> count"""
+    vote_counts: Dict[str, Dict[str, int]] = {}
+    if not poll_ids:
+        return vote_counts
+    async for row in db.votes.aggregate([
+        {"$match": {"poll_id": {"$in": poll_ids}}},
+        {"$group": {"_id": {"poll_id": "$poll_id", "option_id": "$option_id"}, "count": {"$sum": 1}}}
+    ]):
+        vote_counts.setdefault(row["_id"]["poll_id"], {})[row["_id"]["option_id"]] = row["count"]
+    return vote_counts
+
+def apply_vote_counts(polls: List[dict], vote_counts: Dict[str, Dict[str, int]]):
+    """Overwrite the option counters of the given poll documents in memory"""
+    for poll in polls:
+        poll_counts = vote_counts.get(poll["id"], {})
+        for option in poll["options"]:
+            option["votes"] = poll_counts.get(option["id"], 0)
+
+async def update_poll_results(poll_id: str) -> Optional[dict]:
+    """Reconcile a poll's option counters with a full recount of its votes.
     
-    # Update poll options with vote counts
-    poll = await db.polls.find_one({"id": poll_id})
+    Votes are tallied incrementally by submit_vote; this is only needed to repair
+    drift when results are explicitly reconciled. Only closed polls are recounted,
+    as the `$set` would otherwise overwrite increments flushed during the recount.
+    Returns the corrected poll.
+    """
+    poll = await db.polls.find_one({"id": poll_id, "status": PollStatus.CLOSED})
     if poll:
-        for option in poll["options"]:
-            option["votes"] = vote_counts.get(option["id"], 0)
-        
+        apply_vote_counts([poll], await count_votes([poll_id]))
         await db.polls.update_one(
-            {"id": poll_id},
+            {"id": poll_id, "status": PollStatus.CLOSED},
             {"$set": {"options": poll["options"]}}
         )
+    return poll
 
 @api_router.get("/polls/{poll_id}/results")
-async def get_poll_results(poll_id: str):
-    poll = await db.polls.find_one({"id": poll_id})
-    if not poll:
+async def get_poll_results(poll_id: str, reconcile: bool = False):
+    updated_poll = await db.polls.find_one({"id": poll_id})
+    if not updated_poll:
         raise HTTPException(status_code=404, detail="Poll not found")
     
-    await update_poll_results(poll_id)
-    updated_poll = await db.polls.find_one({"id": poll_id})
+    # Counters are kept up to date by submit_vote; only recount on request
+    if reconcile:
+        if updated_poll["status"] != PollStatus.CLOSED:
+            raise HTTPException(status_code=400, detail="Only closed polls can be reconciled")
+        await tally_engine.flush()
+        updated_poll = await update_poll_results(poll_id)
+        tally_engine.evict(poll_id)
+        if not updated_poll:
+            raise HTTPException(status_code=404, detail="Poll not found")
     
     total_votes = sum(opt["votes"] for opt in updated_poll["options"])
     
@@ -353,157 +1811,32 @@ async def get_poll_results(poll_id: str):
             "percentage": round(percentage, 1)
         })
     
-    return {
+    return json_response({
         "question": updated_poll["question"],
         "results": results,
         "total_votes": total_votes
-    }
+    })
 
-def generate_pdf_report(meeting_data, participants_data, polls_data):
-    """Generate PDF report for the meeting"""
-    
-    # Create temporary file
-    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.pdf')
-    temp_path = temp_file.name
-    temp_file.close()
-    
-    # Create PDF document
-    doc = SimpleDocTemplate(temp_path, pagesize=A4)
-    styles = getSampleStyleSheet()
-    story = []
-    
-    # Title style
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=24,
-        textColor=colors.HexColor('#1e40af'),
-        alignment=TA_CENTER,
-        spaceAfter=30
-    )
-    
-    # Subtitle style
-    subtitle_style = ParagraphStyle(
-        'CustomSubtitle',
-        parent=styles['Heading2'],
-        fontSize=16,
-        textColor=colors.HexColor('#374151'),
-        spaceAfter=20
-    )
-    
-    # Add title
-    story.append(Paragraph("RAPPORT DE VOTE SECRET", title_style))
-    story.append(Spacer(1, 20))
-    
-    # Meeting info
-    story.append(Paragraph(f"<b>Réunion:</b> {meeting_data['title']}", styles['Normal']))
-    story.append(Paragraph(f"<b>Organisateur:</b> {meeting_data['organizer_name']}", styles['Normal']))
-    story.append(Paragraph(f"<b>Code de réunion:</b> {meeting_data['meeting_code']}", styles['Normal']))
-    story.append(Paragraph(f"<b>Date de génération:</b> {datetime.now().strftime('%d/%m/%Y à %H:%M')}", styles['Normal']))
-    story.append(Spacer(1, 30))
-    
-    # Participants section
-    story.append(Paragraph("PARTICIPANTS APPROUVÉS", subtitle_style))
-    
-    # Create participants table
-    approved_participants = [p for p in participants_data if p['approval_status'] == 'approved']
-    
-    if approved_participants:
-        participants_table_data = [['#', 'Nom', 'Heure de participation']]
-        for i, participant in enumerate(approved_participants, 1):
-            # Handle both datetime objects and ISO strings
-            if isinstance(participant['joined_at'], str):
-                joined_time = datetime.fromisoformat(participant['joined_at'].replace('Z', '+00:00')).strftime('%H:%M')
-            else:
-                joined_time = participant['joined_at'].strftime('%H:%M')
-            participants_table_data.append([str(i), participant['name'], joined_time])
-        
-        participants_table = Table(participants_table_data, colWidths=[0.5*inch, 3*inch, 1.5*inch])
-        participants_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#f3f4f6')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('FONTSIZE', (0, 1), (-1, -1), 10),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ]))
-        story.append(participants_table)
-        story.append(Paragraph(f"<b>Total des participants approuvés:</b> {len(approved_participants)}", styles['Normal']))
-    else:
-        story.append(Paragraph("Aucun participant approuvé", styles['Normal']))
-    
-    story.append(Spacer(1, 30))
-    
-    # Polls section
-    story.append(Paragraph("RÉSULTATS DES SONDAGES", subtitle_style))
-    
-    if polls_data:
-        for i, poll in enumerate(polls_data, 1):
-            # Poll question
-            story.append(Paragraph(f"<b>Sondage {i}:</b> {poll['question']}", styles['Heading3']))
-            story.append(Spacer(1, 10))
-            
-            # Calculate total votes
-            total_votes = sum(opt['votes'] for opt in poll['options'])
-            
-            if total_votes > 0:
-                # Create results table
-                results_data = [['Option', 'Votes', 'Pourcentage']]
-                for option in poll['options']:
-                    percentage = (option['votes'] / total_votes * 100) if total_votes > 0 else 0
-                    results_data.append([
-                        option['text'],
-                        str(option['votes']),
-                        f"{percentage:.1f}%"
-                    ])
-                
-                # Add total row
-                results_data.append(['TOTAL', str(total_votes), '100.0%'])
-                
-                results_table = Table(results_data, colWidths=[3*inch, 1*inch, 1*inch])
-                results_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#f3f4f6')),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
-                    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                    ('ALIGN', (1, 0), (-1, -1), 'CENTER'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, 0), 11),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                    ('BACKGROUND', (0, 1), (-1, -2), colors.white),
-                    ('BACKGROUND', (0, -1), (-1, -1), colors.HexColor('#e5e7eb')),
-                    ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                    ('FONTSIZE', (0, 1), (-1, -1), 10),
-                    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                ]))
-                story.append(results_table)
-            else:
-                story.append(Paragraph("Aucun vote enregistré pour ce sondage", styles['Normal']))
-            
-            story.append(Spacer(1, 20))
-    else:
-        story.append(Paragraph("Aucun sondage n'a été créé lors de cette réunion", styles['Normal']))
-    
-    # Footer
-    story.append(Spacer(1, 50))
-    footer_style = ParagraphStyle(
-        'Footer',
-        parent=styles['Normal'],
-        fontSize=9,
-        textColor=colors.grey,
-        alignment=TA_CENTER
+def report_snapshot(meeting: dict, participants: List[dict], polls: List[dict]) -> tuple:
+    """Plain-data copy of what the PDF needs, cheap to send to a report worker"""
+    return (
+        {key: meeting[key] for key in ("title", "organizer_name", "meeting_code")},
+        [
+            {key: p[key] for key in ("name", "approval_status", "joined_at")}
+            for p in participants
+        ],
+        [
+            {
+                "question": poll["question"],
+                "options": [{"text": opt["text"], "votes": opt["votes"]} for opt in poll["options"]]
+            }
+            for poll in polls
+        ]
     )
-    story.append(Paragraph("Rapport généré par le système Vote Secret", footer_style))
-    story.append(Paragraph("Toutes les données de cette réunion ont été supprimées après génération de ce rapport", footer_style))
-    
-    # Build PDF
-    doc.build(story)
-    
-    return temp_path
+
+def iter_chunks(data: bytes, chunk_size: int = 64 * 1024):
+    for start in range(0, len(data), chunk_size):
+        yield data[start:start + chunk_size]
 
 @api_router.get("/meetings/{meeting_id}/report")
 async def generate_meeting_report(meeting_id: str):
@@ -514,22 +1847,45 @@ async def generate_meeting_report(meeting_id: str):
     if not meeting:
         raise HTTPException(status_code=404, detail="Meeting not found")
     
-    # Get participants data
-    participants = await db.participants.find({"meeting_id": meeting_id}).to_list(1000)
+    # Get polls data; their final results are recounted below
+    updated_polls = [poll async for poll in db.polls.find(
+        {"meeting_id": meeting_id},
+        {"_id": 0, "id": 1, "question": 1, "options": 1},
+        batch_size=CURSOR_BATCH_SIZE
+    )]
+    poll_ids = [poll["id"] for poll in updated_polls]
     
-    # Get polls data with updated results
-    polls = await db.polls.find({"meeting_id": meeting_id}).to_list(1000)
+    # Refuse ballots until the data is deleted, so every counted vote is in the PDF
+    # and none is written after the deletion, then count what is still buffered
+    for poll_id in poll_ids:
+        tally_engine.begin_close(poll_id)
+    try:
+        await tally_engine.flush()
+        return await render_and_delete_meeting(meeting, updated_polls)
+    finally:
+        for poll_id in poll_ids:
+            tally_engine.end_close(poll_id)
+
+async def render_and_delete_meeting(meeting: dict, updated_polls: List[dict]):
+    meeting_id = meeting["id"]
     
-    # Update all poll results before generating report
-    for poll in polls:
-        await update_poll_results(poll["id"])
+    # Get participants data, only approved participants appear in the report
+    participants = [p async for p in db.participants.find(
+        {"meeting_id": meeting_id, "approval_status": ParticipantStatus.APPROVED},
+        {"_id": 0, "name": 1, "approval_status": 1, "joined_at": 1},
+        batch_size=CURSOR_BATCH_SIZE
+    )]
     
-    # Get updated polls with final results
-    updated_polls = await db.polls.find({"meeting_id": meeting_id}).to_list(1000)
+    # Final results, recounted for every poll in one aggregation
+    apply_vote_counts(updated_polls, await count_votes([poll["id"] for poll in updated_polls]))
     
     try:
-        # Generate PDF
-        pdf_path = generate_pdf_report(meeting, participants, updated_polls)
+        # Render the PDF in a worker process so the event loop keeps serving other meetings
+        async with report_slots:
+            with PDF_RENDER_SECONDS.time():
+                pdf_bytes = await asyncio.get_running_loop().run_in_executor(
+                    report_executor, generate_pdf_report, *report_snapshot(meeting, participants, updated_polls)
+                )
         
         # Create filename
         safe_title = "".join(c for c in meeting['title'] if c.isalnum() or c in (' ', '-', '_')).rstrip()
@@ -540,10 +1896,16 @@ async def generate_meeting_report(meeting_id: str):
             {"id": meeting_id},
             {"$set": {"status": MeetingStatus.COMPLETED, "completed_at": datetime.utcnow()}}
         )
+        meeting_code_cache.invalidate(meeting["meeting_code"])
         
         # Delete all associated data after PDF generation
         # Delete votes first (they reference polls)
         poll_ids = [poll["id"] for poll in updated_polls]
+        for poll_id in poll_ids:
+            try:
+                VOTES_RECORDED.remove(poll_id)
+            except KeyError:
+                pass  # No vote was recorded by this worker
         if poll_ids:
             delete_votes_result = await db.votes.delete_many({"poll_id": {"$in": poll_ids}})
             logger.info(f"Deleted {delete_votes_result.deleted_count} votes for meeting {meeting_id}")
@@ -560,39 +1922,110 @@ async def generate_meeting_report(meeting_id: str):
         delete_meeting_result = await db.meetings.delete_one({"id": meeting_id})
         logger.info(f"Deleted meeting {meeting_id}")
         
+        # Let every worker drop what it still caches for this meeting
+        await manager.send_to_meeting({
+            "type": "meeting_completed",
+            "meeting_code": meeting["meeting_code"]
+        }, meeting_id)
+        
         logger.info(f"Complete data cleanup finished for meeting {meeting_id}")
         
-        # Return the PDF file
-        return FileResponse(
-            path=pdf_path,
-            filename=filename,
+        # Stream the PDF from memory
+        return StreamingResponse(
+            iter_chunks(pdf_bytes),
             media_type='application/pdf',
-            headers={"Content-Disposition": f"attachment; filename={filename}"}
+            headers={
+                "Content-Disposition": f"attachment; filename={filename}",
+                "Content-Length": str(len(pdf_bytes))
+            }
         )
         
     except Exception as e:
         logger.error(f"Error generating report for meeting {meeting_id}: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error generating report: {str(e)}")
 
+@api_router.get("/stats")
+async def get_stats():
+    """Internal counters used to tune vote ingestion and caches"""
+    return {
+        "ingestion": tally_engine.stats(),
+        "meeting_code_cache": meeting_code_cache.stats()
+    }
+
+@api_router.get("/metrics")
+async def get_metrics():
+    """Prometheus metrics, summed over every worker when PROMETHEUS_MULTIPROC_DIR is set"""
+    if PROMETHEUS_MULTIPROC_DIR:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return Response(content=generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
+    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+# Spawned (not forked) so workers start clean, without the server's event loop and client threads
+report_executor = ProcessPoolExecutor(max_workers=REPORT_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+report_slots = asyncio.Semaphore(REPORT_WORKERS)
+
 # WebSocket endpoint
+async def get_meeting_snapshot(meeting_id: str) -> dict:
+    """Full meeting state for sockets whose missed events are no longer buffered"""
+    participants = [p async for p in db.participants.find(
+        {"meeting_id": meeting_id}, PARTICIPANT_FIELDS, batch_size=CURSOR_BATCH_SIZE
+    )]
+    polls = [poll async for poll in db.polls.find(
+        {"meeting_id": meeting_id}, POLL_FIELDS, batch_size=CURSOR_BATCH_SIZE
+    )]
+    
+    # Active polls have fresher counts in the tally engine than in the database
+    for i, poll in enumerate(polls):
+        cached = tally_engine.active_polls.get(poll["id"])
+        if cached:
+            polls[i] = cached["poll"]
+    
+    return {
+        "participants": participants,
+        "polls": polls
+    }
+
 @app.websocket("/ws/meetings/{meeting_id}")
-async def websocket_endpoint(websocket: WebSocket, meeting_id: str):
-    await manager.connect(websocket, meeting_id)
+async def websocket_endpoint(websocket: WebSocket, meeting_id: str, since: Optional[int] = None):
+    snapshot = None
+    if since is not None and (not manager.can_replay(meeting_id, since)
+                              or manager.current_seq(meeting_id) - since > manager.queue_size):
+        # Too far behind for the replay buffer, or for what the socket queue holds:
+        # resync from a snapshot, then replay what follows it
+        since = manager.current_seq(meeting_id)
+        snapshot = {"type": "snapshot", "seq": since, **await get_meeting_snapshot(meeting_id)}
+    connection = await manager.connect(websocket, meeting_id, since, snapshot)
     try:
         while True:
+            # Clients only send heartbeat pongs; any message counts as a sign of life
             await websocket.receive_text()
+            connection.last_seen = time.monotonic()
     except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        # Closed by the server (reaped, slow or meeting completed) or a broken transport
+        logger.debug(f"WebSocket receive loop ended for meeting {meeting_id}: {str(e)}")
+    finally:
         manager.disconnect(websocket, meeting_id)
 
 # Health check endpoint for Docker
 @api_router.get("/")
 async def health_check():
-    """Health check endpoint for Docker containers"""
+    """Health check endpoint for Docker containers, healthy once the database pool is warm"""
+    if not database_ready.is_set():
+        return Response(
+            content=encode_json({"status": "starting", "service": "vote-secret-backend"}),
+            status_code=503,
+            media_type="application/json"
+        )
     return {"status": "healthy", "service": "vote-secret-backend"}
 
 # Include the router in the main app
 app.include_router(api_router)
 
+app.add_middleware(MetricsMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_credentials=True,
@@ -608,6 +2041,74 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Set once the database is warm, indexed and the poll timers are loaded
+database_ready = asyncio.Event()
+
+async def warm_up_database() -> bool:
+    """Open MONGO_MIN_POOL_SIZE connections at once and ping the database through them"""
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(*(client.admin.command("ping") for _ in range(max(MONGO_MIN_POOL_SIZE, 1))))
+    except Exception as e:
+        logger.error(f"Database warm-up failed: {str(e)}")
+        return False
+    record_startup_timing("database_warmup", time.perf_counter() - start)
+    return True
+
+async def ensure_indexes():
+    """Create the indexes used by every lookup; a no-op when they already exist"""
+    total_start = time.perf_counter()
+    for collection, indexes in INDEXES.items():
+        for keys, options in indexes:
+            start = time.perf_counter()
+            try:
+                name = await db[collection].create_index(keys, **options)
+                logger.info(f"Index {collection}.{name} ready in {(time.perf_counter() - start) * 1000:.1f} ms")
+            except Exception as e:
+                logger.error(f"Could not create index {keys} on {collection}: {str(e)}")
+    logger.info(f"Index bootstrap finished in {(time.perf_counter() - total_start) * 1000:.1f} ms")
+
+async def prepare_database():
+    """Wait for MongoDB, then run every startup step that needs it, in order"""
+    while not await warm_up_database():
+        await asyncio.sleep(2)
+    await manager.start()
+    await ensure_indexes()
+    try:
+        await poll_scheduler.load()
+    except Exception as e:
+        logger.error(f"Could not load poll timers: {str(e)}")
+    database_ready.set()
+
+@app.on_event("startup")
+async def start_background_services():
+    record_startup_timing("import", IMPORT_SECONDS)
+    if BROADCAST_BACKEND == "memory" and int(os.environ.get('WEB_CONCURRENCY', '1')) > 1:
+        logger.warning("BROADCAST_BACKEND=memory with several workers: meeting events will not reach sockets held by other workers")
+    tally_engine.start()
+    poll_scheduler.start()
+    
+    # Give a reachable database time to get ready before serving, but never block startup on it:
+    # until it is ready /api/ answers 503 and the preparation carries on in the background
+    app.state.prepare_task = asyncio.create_task(prepare_database())
+    try:
+        await asyncio.wait_for(asyncio.shield(app.state.prepare_task), timeout=MONGO_STARTUP_WAIT)
+    except asyncio.TimeoutError:
+        logger.warning(f"Database not ready after {MONGO_STARTUP_WAIT:.0f} s, serving while it is prepared")
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
-    client.close()
\ No newline at end of file
+    prepare_task = getattr(app.state, "prepare_task", None)
+    if prepare_task:
+        prepare_task.cancel()
+    vote_broadcaster.stop()
+    await poll_scheduler.stop()
+    await tally_engine.stop()
+    await manager.stop()
+    report_executor.shutdown(wait=False, cancel_futures=True)
+    client.close()
+    if PROMETHEUS_MULTIPROC_DIR:
+        # Drops this worker's live gauges (sockets, startup timings) from the sums
+        multiprocess.mark_process_dead(os.getpid())
+
+IMPORT_SECONDS = time.perf_counter() - IMPORT_STARTED
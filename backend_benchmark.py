@@ -0,0 +1,131 @@
+"""CPU cost of encoding the organizer and participant read endpoints.
+
+Compares the previous response path (Pydantic models re-validated from the
+Mongo documents, then serialized by FastAPI's jsonable_encoder + json.dumps)
+with the projected-document orjson path now used by server.py, on a synthetic
+1,000-participant, 30-poll meeting. No database is needed.
+
+Usage: python backend_benchmark.py [--participants 1000] [--polls 30] [--iterations 200]
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "backend"))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+import server  # noqa: E402
+from server import Meeting, Participant, Poll, iter_json_array, encode_json  # noqa: E402
+
+
+def build_meeting(participant_count, poll_count):
+    """Documents shaped like the projected MongoDB results of the endpoints"""
+    meeting = Meeting(title="Assemblée générale", organizer_name="Bureau").dict()
+    participants = [
+        Participant(name=f"Membre {i}", meeting_id=meeting["id"],
+                    approval_status=server.ParticipantStatus.APPROVED).dict(exclude={"member_code"})
+        for i in range(participant_count)
+    ]
+    polls = [
+        Poll(
+            meeting_id=meeting["id"],
+            question=f"Résolution {i}",
+            options=[{"id": str(uuid.uuid4()), "text": text, "votes": 300} for text in ("Pour", "Contre", "Abstention")],
+            status=server.PollStatus.CLOSED,
+            timer_started_at=datetime.utcnow()
+        ).dict()
+        for i in range(poll_count)
+    ]
+    return meeting, participants, polls
+
+
+def fastapi_render(content):
+    """What FastAPI did for a plain return value: jsonable_encoder then JSONResponse.render"""
+    return json.dumps(jsonable_encoder(content), ensure_ascii=False, allow_nan=False,
+                      indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def old_organizer_view(meeting, participants, polls):
+    return fastapi_render({
+        "meeting": Meeting(**meeting),
+        "participants": [Participant(**p) for p in participants],
+        "polls": [Poll(**poll) for poll in polls]
+    })
+
+
+def old_meeting_polls(polls):
+    return fastapi_render([Poll(**poll) for poll in polls])
+
+
+async def as_cursor(docs):
+    for doc in docs:
+        yield doc
+
+
+async def drain(chunks):
+    return b"".join([chunk async for chunk in chunks])
+
+
+async def new_organizer_view(meeting, participants, polls):
+    body = b'{"meeting": ' + encode_json(meeting) + b', "participants": '
+    body += await drain(iter_json_array(as_cursor(participants)))
+    body += b', "polls": ' + await drain(iter_json_array(as_cursor(polls))) + b"}"
+    return body
+
+
+async def new_meeting_polls(polls):
+    return await drain(iter_json_array(as_cursor(polls)))
+
+
+def measure(label, func, iterations):
+    """CPU milliseconds per call"""
+    func()  # Warm up
+    start = time.process_time()
+    for _ in range(iterations):
+        func()
+    per_call = (time.process_time() - start) / iterations * 1000
+    print(f"   {label:<28} {per_call:8.3f} ms CPU/request")
+    return per_call
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--participants", type=int, default=1000)
+    parser.add_argument("--polls", type=int, default=30)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    meeting, participants, polls = build_meeting(args.participants, args.polls)
+    loop = asyncio.new_event_loop()
+
+    # Both paths must produce the same JSON
+    old = json.loads(old_organizer_view(meeting, participants, polls))
+    new = json.loads(loop.run_until_complete(new_organizer_view(meeting, participants, polls)))
+    for p in old["participants"]:
+        p.pop("member_code")
+    assert old == new, "organizer view payloads differ"
+
+    print(f"📊 {args.participants} participants, {args.polls} polls, {args.iterations} iterations")
+    for endpoint, old_func, new_func in (
+        ("GET /meetings/{id}/organizer",
+         lambda: old_organizer_view(meeting, participants, polls),
+         lambda: loop.run_until_complete(new_organizer_view(meeting, participants, polls))),
+        ("GET /meetings/{id}/polls",
+         lambda: old_meeting_polls(polls),
+         lambda: loop.run_until_complete(new_meeting_polls(polls))),
+    ):
+        print(f"\n🔍 {endpoint}")
+        before = measure("Pydantic + jsonable_encoder", old_func, args.iterations)
+        after = measure("projected docs + orjson", new_func, args.iterations)
+        print(f"   ✅ saved {before - after:.3f} ms CPU/request ({before / after:.1f}x faster)")
+
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+"""Local load test simulating a full voting session against server:app.
+
+The app is served in-process by uvicorn on a free local port, backed either by
+a local mongod (--mongo-url) or by an in-process Motor stand-in (--in-memory,
+needs mongomock-motor). The session:
+
+1. the organizer creates a meeting;
+2. N participants join concurrently;
+3. the organizer approves them all with one bulk request;
+4. L WebSocket listeners connect to the meeting and stay open;
+5. M polls are created and started;
+6. every participant votes on every poll in one burst;
+7. the polls are closed.
+
+It reports throughput and p50/p95/p99 latency per endpoint, plus broadcast
+delivery lag measured by the listeners, and can save the results as a
+baseline JSON file for later runs to compare against.
+
+Usage:
+    python backend_load_test.py --in-memory --participants 500 --polls 5
+    python backend_load_test.py --mongo-url mongodb://localhost:27017 --save-baseline baseline.json
+    python backend_load_test.py --in-memory --compare baseline.json
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import socket
+import sys
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "backend"))
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(samples):
+    """samples: list of seconds -> stats in milliseconds"""
+    return {
+        "count": len(samples),
+        "p50_ms": round(percentile(samples, 50) * 1000, 2),
+        "p95_ms": round(percentile(samples, 95) * 1000, 2),
+        "p99_ms": round(percentile(samples, 99) * 1000, 2),
+        "max_ms": round(max(samples) * 1000, 2) if samples else 0.0,
+    }
+
+
+class LoadTester:
+    def __init__(self, base_url, ws_url, concurrency):
+        self.base_url = base_url
+        self.ws_url = ws_url
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.latencies = {}
+        self.phase_durations = {}
+        self.errors = {}
+        self.sent_at = {}
+        self.delivery_lags = {}
+        self.listeners_ready = 0
+
+    async def call(self, http, endpoint, method, path, **kwargs):
+        """One timed request, recorded under its endpoint template"""
+        async with self.semaphore:
+            start = time.perf_counter()
+            response = await http.request(method, path, **kwargs)
+            elapsed = time.perf_counter() - start
+        self.latencies.setdefault(endpoint, []).append(elapsed)
+        if response.status_code >= 400:
+            self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+        return response
+
+    async def phase(self, name, coroutines):
+        start = time.perf_counter()
+        results = await asyncio.gather(*coroutines)
+        self.phase_durations[name] = (time.perf_counter() - start, len(results))
+        return results
+
+    async def listen(self, meeting_id, expected_votes, done):
+        """Hold a meeting socket open and record when each tracked event arrives"""
+        import websockets
+
+        async with websockets.connect(f"{self.ws_url}/ws/meetings/{meeting_id}", max_queue=None) as ws:
+            self.listeners_ready += 1
+            while not done.is_set():
+                try:
+                    raw = await asyncio.wait_for(ws.recv(), timeout=0.5)
+                except asyncio.TimeoutError:
+                    continue
+                received = time.perf_counter()
+                message = json.loads(raw)
+                if message.get("type") == "ping":
+                    await ws.send(json.dumps({"type": "pong"}))
+                elif message.get("type") in ("poll_started", "poll_closed"):
+                    key = (message["type"], message["poll_id"])
+                    if key in self.sent_at:
+                        self.delivery_lags.setdefault(message["type"], []).append(received - self.sent_at[key])
+                elif message.get("type") == "vote_submitted":
+                    # Lag between the last accepted vote and the tally that includes it
+                    if sum(message["counts"]) == expected_votes and ("votes_done", message["poll_id"]) in self.sent_at:
+                        lag = received - self.sent_at[("votes_done", message["poll_id"])]
+                        self.delivery_lags.setdefault("final_tally", []).append(max(lag, 0.0))
+
+    async def run(self, http, participant_count, poll_count, listener_count):
+        meeting = (await self.call(http, "POST /meetings", "POST", "/api/meetings", json={
+            "title": "Load test", "organizer_name": "Load tester"
+        })).json()
+
+        await self.phase("join", [
+            self.call(http, "POST /participants/join", "POST", "/api/participants/join", json={
+                "name": f"Participant {i} {uuid.uuid4().hex[:6]}", "meeting_code": meeting["meeting_code"]
+            })
+            for i in range(participant_count)
+        ])
+
+        await self.phase("approve", [
+            self.call(http, "POST /meetings/{id}/participants/approve", "POST",
+                      f"/api/meetings/{meeting['id']}/participants/approve",
+                      json={"participant_ids": None, "approved": True})
+        ])
+
+        done = asyncio.Event()
+        listeners = [
+            asyncio.create_task(self.listen(meeting["id"], participant_count, done))
+            for _ in range(listener_count)
+        ]
+        while self.listeners_ready < listener_count:
+            await asyncio.sleep(0.05)
+
+        polls = await self.phase("create_polls", [
+            self.call(http, "POST /meetings/{id}/polls", "POST", f"/api/meetings/{meeting['id']}/polls", json={
+                "question": f"Question {i}", "options": ["Pour", "Contre", "Abstention"]
+            })
+            for i in range(poll_count)
+        ])
+        polls = [response.json() for response in polls]
+
+        async def start(poll):
+            self.sent_at[("poll_started", poll["id"])] = time.perf_counter()
+            await self.call(http, "POST /polls/{id}/start", "POST", f"/api/polls/{poll['id']}/start")
+        await self.phase("start_polls", [start(poll) for poll in polls])
+
+        async def vote(poll, i):
+            await self.call(http, "POST /votes", "POST", "/api/votes", json={
+                "poll_id": poll["id"], "option_id": poll["options"][i % len(poll["options"])]["id"]
+            })
+            self.sent_at[("votes_done", poll["id"])] = time.perf_counter()
+        await self.phase("vote_burst", [vote(poll, i) for poll in polls for i in range(participant_count)])
+
+        await self.phase("organizer_view", [
+            self.call(http, "GET /meetings/{id}/organizer", "GET", f"/api/meetings/{meeting['id']}/organizer")
+            for _ in range(20)
+        ])
+
+        async def close(poll):
+            self.sent_at[("poll_closed", poll["id"])] = time.perf_counter()
+            await self.call(http, "POST /polls/{id}/close", "POST", f"/api/polls/{poll['id']}/close")
+        await self.phase("close_polls", [close(poll) for poll in polls])
+
+        # Give the listeners time to receive the last broadcasts
+        await asyncio.sleep(1)
+        done.set()
+        await asyncio.gather(*listeners)
+
+    def results(self, args):
+        return {
+            "config": {
+                "participants": args.participants,
+                "polls": args.polls,
+                "listeners": args.listeners,
+                "concurrency": args.concurrency,
+                "backend": "in-memory" if args.in_memory else "mongod",
+            },
+            "phases": {
+                name: {"seconds": round(seconds, 3), "requests": count,
+                       "throughput_rps": round(count / seconds, 1) if seconds else 0.0}
+                for name, (seconds, count) in self.phase_durations.items()
+            },
+            "endpoints": {endpoint: summarize(samples) for endpoint, samples in self.latencies.items()},
+            "broadcast_lag": {event: summarize(samples) for event, samples in self.delivery_lags.items()},
+            "errors": self.errors,
+        }
+
+
+def print_results(results, baseline=None):
+    def delta(current, previous):
+        if previous is None or not previous:
+            return ""
+        change = (current - previous) / previous * 100
+        return f" ({'+' if change >= 0 else ''}{change:.0f}% vs baseline)"
+
+    print("\n📊 Phases")
+    for name, phase in results["phases"].items():
+        previous = (baseline or {}).get("phases", {}).get(name, {}).get("throughput_rps")
+        print(f"   {name:<16} {phase['requests']:>6} req in {phase['seconds']:>7.3f}s  "
+              f"{phase['throughput_rps']:>8.1f} req/s{delta(phase['throughput_rps'], previous)}")
+
+    for title, section in (("Endpoints", "endpoints"), ("Broadcast delivery lag", "broadcast_lag")):
+        print(f"\n📊 {title}")
+        for name, stats in results[section].items():
+            previous = (baseline or {}).get(section, {}).get(name, {}).get("p99_ms")
+            print(f"   {name:<42} n={stats['count']:<6} p50={stats['p50_ms']:>8.2f}ms "
+                  f"p95={stats['p95_ms']:>8.2f}ms p99={stats['p99_ms']:>8.2f}ms{delta(stats['p99_ms'], previous)}")
+
+    if results["errors"]:
+        print(f"\n❌ Errors: {results['errors']}")
+    else:
+        print("\n✅ No request errors")
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def main(args):
+    import httpx
+    import uvicorn
+
+    os.environ.setdefault("MONGO_URL", args.mongo_url)
+    os.environ.setdefault("DB_NAME", args.db_name)
+    import server
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    if args.in_memory:
+        try:
+            from mongomock_motor import AsyncMongoMockClient
+        except ImportError:
+            sys.exit("--in-memory needs mongomock-motor: pip install mongomock-motor")
+        server.client = AsyncMongoMockClient()
+        server.db = server.client[args.db_name]
+
+    port = free_port()
+    uvicorn_server = uvicorn.Server(uvicorn.Config(server.app, host="127.0.0.1", port=port, log_level="warning"))
+    serving = asyncio.create_task(uvicorn_server.serve())
+    while not uvicorn_server.started:
+        await asyncio.sleep(0.05)
+
+    tester = LoadTester(f"http://127.0.0.1:{port}", f"ws://127.0.0.1:{port}", args.concurrency)
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    try:
+        async with httpx.AsyncClient(base_url=tester.base_url, limits=limits, timeout=60) as http:
+            await tester.run(http, args.participants, args.polls, args.listeners)
+    finally:
+        uvicorn_server.should_exit = True
+        await serving
+
+    results = tester.results(args)
+    baseline = json.loads(Path(args.compare).read_text()) if args.compare else None
+    print_results(results, baseline)
+    if args.save_baseline:
+        Path(args.save_baseline).write_text(json.dumps(results, indent=2))
+        print(f"\n💾 Baseline saved to {args.save_baseline}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local load test of a full voting session")
+    parser.add_argument("--participants", type=int, default=200)
+    parser.add_argument("--polls", type=int, default=3)
+    parser.add_argument("--listeners", type=int, default=50, help="WebSocket connections held open")
+    parser.add_argument("--concurrency", type=int, default=100, help="Requests in flight at once")
+    parser.add_argument("--mongo-url", default="mongodb://localhost:27017")
+    parser.add_argument("--db-name", default=f"vote_load_test_{uuid.uuid4().hex[:8]}")
+    parser.add_argument("--in-memory", action="store_true", help="Use mongomock-motor instead of a mongod")
+    parser.add_argument("--save-baseline", help="Write the results to this JSON file")
+    parser.add_argument("--compare", help="Compare against a baseline JSON file")
+    asyncio.run(main(parser.parse_args()))
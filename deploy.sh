@@ -347,7 +347,13 @@ EXPOSE 8001
 HEALTHCHECK --interval=30s --timeout=10s --start-period=40s --retries=3 \
     CMD curl -f http://localhost:8001/api/ || exit 1
 
-CMD ["uvicorn", "server:app", "--host", "0.0.0.0", "--port", "8001", "--workers", "1"]
+# Nombre de workers uvicorn ; au-delà de 1, utiliser BROADCAST_BACKEND=mongo
+ENV WEB_CONCURRENCY=1
+ENV BROADCAST_BACKEND=memory
+# Métriques Prometheus additionnées sur tous les workers ; vidé à chaque démarrage
+ENV PROMETHEUS_MULTIPROC_DIR=/tmp/prometheus
+
+CMD ["sh", "-c", "rm -rf \"$PROMETHEUS_MULTIPROC_DIR\" && mkdir -p \"$PROMETHEUS_MULTIPROC_DIR\" && exec uvicorn server:app --host 0.0.0.0 --port 8001"]
 EOF
 
     # Docker Compose optimisé (versions 2025)
@@ -15,11 +15,101 @@ const API = `${BACKEND_URL}/api`;
 
 console.log("🔍 Environment loaded:", { BACKEND_URL, API });
 
+const WS_URL = BACKEND_URL.replace('https://', 'wss://').replace('http://', 'ws://');
+
+// Watch a meeting through its sequenced WebSocket; onChange receives the new events,
+// or null when the whole state must be reloaded. The long-poll is only used when the
+// socket cannot connect at all. Returns a function that stops watching.
+const watchMeeting = (meetingId, onChange) => {
+  let stopped = false;
+  let websocket = null;
+  let lastSeq = null;
+
+  const deliver = (events) => {
+    onChange(events);
+    // The meeting and its events are deleted, there is nothing left to watch
+    if (events !== null && events.some(event => event.type === "meeting_completed")) {
+      stop();
+    }
+  };
+
+  // `since` is the last event seq received, so a reconnect only replays what was missed
+  const connect = () => {
+    const query = lastSeq !== null ? `?since=${lastSeq}` : "";
+    let opened = false;
+    websocket = new WebSocket(`${WS_URL}/ws/meetings/${meetingId}${query}`);
+
+    websocket.onopen = () => {
+      opened = true;
+      // First connection: load the current state, later events arrive on the socket
+      if (lastSeq === null) {
+        lastSeq = 0;
+        deliver(null);
+      }
+    };
+
+    websocket.onmessage = (event) => {
+      const data = JSON.parse(event.data);
+      // Answer heartbeats, or the server drops the connection as dead
+      if (data.type === "ping") {
+        websocket.send(JSON.stringify({ type: "pong" }));
+        return;
+      }
+      if (typeof data.seq === "number") {
+        lastSeq = data.seq;
+      }
+      // Too far behind for a replay: the server sent a snapshot instead
+      deliver(data.type === "snapshot" ? null : [data]);
+    };
+
+    websocket.onerror = (error) => {
+      console.error("WebSocket error:", error);
+    };
+
+    websocket.onclose = (event) => {
+      if (stopped || event.code === 1000) return;
+      if (opened) {
+        setTimeout(() => !stopped && connect(), 2000);
+      } else {
+        console.warn("WebSocket unavailable, falling back to long-polling");
+        longPoll(lastSeq === null ? -1 : lastSeq);
+      }
+    };
+  };
+
+  const longPoll = async (version) => {
+    while (!stopped) {
+      try {
+        const response = await axios.get(`${API}/meetings/${meetingId}/wait`, {
+          params: { version, timeout: 25 }
+        });
+        if (stopped) break;
+        if (response.data.version !== version) {
+          version = response.data.version;
+          deliver(response.data.events);
+        }
+      } catch (error) {
+        console.error("Error waiting for meeting changes:", error);
+        await new Promise(resolve => setTimeout(resolve, 3000));
+      }
+    }
+  };
+
+  const stop = () => {
+    stopped = true;
+    if (websocket && websocket.readyState <= WebSocket.OPEN) {
+      websocket.close(1000);
+    }
+  };
+
+  connect();
+  return stop;
+};
+
 function App() {
   const [currentView, setCurrentView] = useState("home"); // home, create, join, organizer, participant
   const [meeting, setMeeting] = useState(null);
   const [participant, setParticipant] = useState(null);
-  const [ws, setWs] = useState(null);
 
   // Home Component
   const Home = () => {
@@ -82,7 +172,6 @@ function App() {
         console.log("✅ Meeting created successfully:", response.data);
         setMeeting(response.data);
         setCurrentView("organizer");
-        connectWebSocket(response.data.id);
       } catch (error) {
         console.error("❌ Error creating meeting:", error);
         alert("Erreur lors de la création de la réunion: " + (error.response?.data?.detail || error.message));
@@ -150,17 +239,24 @@ function App() {
   const JoinMeeting = () => {
     const [name, setName] = useState("");
     const [meetingCode, setMeetingCode] = useState("");
+    const [memberCode, setMemberCode] = useState("");
     const [loading, setLoading] = useState(false);
 
     const handleJoin = async () => {
-      if (!name || !meetingCode) return;
+      if ((!name && !memberCode) || !meetingCode) return;
       
       setLoading(true);
       try {
-        const response = await axios.post(`${API}/participants/join`, {
-          name,
-          meeting_code: meetingCode.toUpperCase()
-        });
+        // Pre-registered members join with their personal code, others by name
+        const response = memberCode
+          ? await axios.post(`${API}/participants/join-member`, {
+              meeting_code: meetingCode.toUpperCase(),
+              member_code: memberCode.toUpperCase()
+            })
+          : await axios.post(`${API}/participants/join`, {
+              name,
+              meeting_code: meetingCode.toUpperCase()
+            });
         setParticipant(response.data);
         
         // Get meeting details
@@ -168,7 +264,6 @@ function App() {
         setMeeting(meetingResponse.data);
         
         setCurrentView("participant");
-        connectWebSocket(meetingResponse.data.id);
       } catch (error) {
         console.error("Error joining meeting:", error);
         alert("Erreur: " + (error.response?.data?.detail || "Impossible de rejoindre la réunion"));
@@ -204,13 +299,22 @@ function App() {
                 className="font-mono"
               />
             </div>
+            <div>
+              <label className="block text-sm font-medium mb-2">Code membre (si pré-inscrit)</label>
+              <Input
+                value={memberCode}
+                onChange={(e) => setMemberCode(e.target.value.toUpperCase())}
+                placeholder="ex: K7M2Q9XA"
+                className="font-mono"
+              />
+            </div>
             <div className="flex space-x-2">
               <Button onClick={() => setCurrentView("home")} variant="outline" className="flex-1">
                 Retour
               </Button>
               <Button 
                 onClick={handleJoin} 
-                disabled={!name || !meetingCode || loading}
+                disabled={(!name && !memberCode) || !meetingCode || loading}
                 className="flex-1 bg-blue-600 hover:bg-blue-700"
               >
                 {loading ? "Connexion..." : "Rejoindre"}
@@ -232,16 +336,29 @@ function App() {
 
     useEffect(() => {
       if (meeting) {
-        loadOrganizerData();
-        // Set up polling for real-time updates every 3 seconds
-        const interval = setInterval(() => {
-          loadOrganizerData();
-        }, 3000);
-        
-        return () => clearInterval(interval);
+        // Follow the meeting's events instead of polling on a fixed interval
+        return watchMeeting(meeting.id, (events) => {
+          if (events !== null && events.every(event => event.type === "vote_submitted")) {
+            applyVoteCounts(events);
+          } else {
+            loadOrganizerData();
+          }
+        });
       }
     }, [meeting]);
 
+    // Tally updates carry the new counts, so no refetch is needed for them
+    const applyVoteCounts = (events) => {
+      setPolls(prev => prev.map(poll => {
+        const latest = events.filter(event => event.poll_id === poll.id).pop();
+        if (!latest) return poll;
+        return {
+          ...poll,
+          options: poll.options.map((option, i) => ({ ...option, votes: latest.counts[i] ?? option.votes }))
+        };
+      }));
+    };
+
     const loadOrganizerData = async () => {
       try {
         const response = await axios.get(`${API}/meetings/${meeting.id}/organizer`);
@@ -264,6 +381,18 @@ function App() {
       }
     };
 
+    const approveAllPending = async (approved) => {
+      try {
+        await axios.post(`${API}/meetings/${meeting.id}/participants/approve`, {
+          participant_ids: null,
+          approved
+        });
+        loadOrganizerData();
+      } catch (error) {
+        console.error("Error approving participants:", error);
+      }
+    };
+
     const createPoll = async () => {
       if (!newPollQuestion || newPollOptions.some(opt => !opt.trim())) return;
       
@@ -386,8 +515,18 @@ function App() {
 
             <TabsContent value="participants">
               <Card>
-                <CardHeader>
+                <CardHeader className="flex flex-row items-center justify-between">
                   <CardTitle>Gestion des participants</CardTitle>
+                  {participants.some(p => p.approval_status === "pending") && (
+                    <div className="flex items-center gap-2">
+                      <Button size="sm" onClick={() => approveAllPending(true)}>
+                        Approuver tous
+                      </Button>
+                      <Button size="sm" variant="outline" onClick={() => approveAllPending(false)}>
+                        Rejeter tous
+                      </Button>
+                    </div>
+                  )}
                 </CardHeader>
                 <CardContent>
                   <div className="space-y-3">
@@ -641,34 +780,39 @@ function App() {
 
     useEffect(() => {
       if (participant) {
-        checkParticipantStatus();
-        loadPolls();
-        // Set up polling for real-time updates every 3 seconds
-        const interval = setInterval(() => {
-          checkParticipantStatus();
-          loadPolls();
-        }, 3000);
-        
-        return () => clearInterval(interval);
+        // Follow the meeting's events instead of polling on a fixed interval
+        return watchMeeting(meeting.id, (events) => {
+          if (events !== null && events.every(event => event.type === "vote_submitted")) {
+            applyVoteCounts(events);
+          } else {
+            loadSnapshot();
+          }
+        });
       }
     }, [participant]);
 
-    const checkParticipantStatus = async () => {
-      try {
-        const response = await axios.get(`${API}/participants/${participant.id}/status`);
-        setStatus(response.data.status);
-      } catch (error) {
-        console.error("Error checking status:", error);
-      }
+    // Tally updates carry the new counts, so no refetch is needed for them
+    const applyVoteCounts = (events) => {
+      setPolls(prev => prev.map(poll => {
+        const latest = events.filter(event => event.poll_id === poll.id).pop();
+        if (!latest) return poll;
+        return {
+          ...poll,
+          options: poll.options.map((option, i) => ({ ...option, votes: latest.counts[i] ?? option.votes }))
+        };
+      }));
     };
 
-    const loadPolls = async () => {
+    // Approval status and active polls in one request; the browser revalidates it
+    // with its ETag, so an unchanged meeting costs a 304 and no database read
+    const loadSnapshot = async () => {
       if (!meeting) return;
       try {
-        const response = await axios.get(`${API}/meetings/${meeting.id}/polls`);
-        setPolls(response.data);
+        const response = await axios.get(`${API}/meetings/${meeting.id}/participants/${participant.id}/snapshot`);
+        setStatus(response.data.status);
+        setPolls(response.data.polls);
       } catch (error) {
-        console.error("Error loading polls:", error);
+        console.error("Error loading snapshot:", error);
       }
     };
 
@@ -680,7 +824,7 @@ function App() {
         });
         
         setVotedPolls(prev => new Set([...prev, pollId]));
-        loadPolls(); // Refresh to see results
+        loadSnapshot(); // Refresh to see results
       } catch (error) {
         console.error("Error submitting vote:", error);
         alert("Erreur lors du vote: " + (error.response?.data?.detail || "Erreur inconnue"));
@@ -811,48 +955,6 @@ function App() {
     );
   };
 
-  // WebSocket connection
-  const connectWebSocket = (meetingId) => {
-    const wsUrl = `${BACKEND_URL.replace('https://', 'wss://').replace('http://', 'ws://')}/ws/meetings/${meetingId}`;
-    const websocket = new WebSocket(wsUrl);
-    
-    websocket.onopen = () => {
-      console.log("WebSocket connected to:", wsUrl);
-      setWs(websocket);
-    };
-    
-    websocket.onmessage = (event) => {
-      const data = JSON.parse(event.data);
-      console.log("WebSocket message received:", data);
-      
-      // Handle real-time updates based on message type
-      if (data.type === "participant_joined" || data.type === "participant_approved") {
-        console.log("Participant update received, refreshing organizer view");
-        // Force refresh for organizer view
-        setTimeout(() => {
-          window.location.reload();
-        }, 500);
-      }
-      
-      if (data.type === "poll_started" || data.type === "poll_closed" || data.type === "vote_submitted") {
-        console.log("Poll update received, refreshing view");
-        // Force refresh for poll updates
-        setTimeout(() => {
-          window.location.reload();
-        }, 500);
-      }
-    };
-    
-    websocket.onerror = (error) => {
-      console.error("WebSocket error:", error);
-    };
-    
-    websocket.onclose = () => {
-      console.log("WebSocket disconnected");
-      setWs(null);
-    };
-  };
-
   // Render current view
   const renderCurrentView = () => {
     switch (currentView) {
@@ -0,0 +1,24 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "vote_tests")
+
+
+@pytest.fixture
+def server():
+    """server.py backed by a fresh in-memory database, without running the startup hooks"""
+    mongomock_motor = pytest.importorskip("mongomock_motor")
+    import server as server_module
+
+    client = mongomock_motor.AsyncMongoMockClient()
+    saved = server_module.client, server_module.db
+    server_module.client, server_module.db = client, client["vote_tests"]
+    yield server_module
+    server_module.client, server_module.db = saved
+    server_module.tally_engine.active_polls.clear()
+    server_module.tally_engine.closing.clear()
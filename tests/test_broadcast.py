@@ -0,0 +1,86 @@
+import asyncio
+
+import pytest
+
+
+@pytest.fixture
+def backend(server, monkeypatch):
+    import mongomock.database
+
+    # mongomock has no capped collections; a plain one replays the same way
+    create_collection = mongomock.database.Database.create_collection
+    monkeypatch.setattr(mongomock.database.Database, "create_collection",
+                        lambda self, name, **kwargs: create_collection(self, name))
+    return server.MongoBroadcastBackend(server.db, 1 << 20, gap_timeout=0.2)
+
+
+def run_tail(backend, scenario):
+    received = []
+
+    async def handler(meeting_id, seq, message):
+        received.append((meeting_id, seq, message["type"]))
+
+    async def main():
+        await backend.start(handler)
+        try:
+            await scenario()
+        finally:
+            await backend.stop()
+    asyncio.run(main())
+    return received
+
+
+def event(position, seq):
+    return {"meeting_id": "m", "position": position, "seq": seq, "message": {"type": f"event-{seq}"}}
+
+
+def test_events_appended_out_of_order_are_delivered_in_order(backend):
+    async def scenario():
+        # Two publishers took positions 1 and 2, the second one appends first
+        await backend.counters.insert_one({"_id": backend.COUNTER_ID, "position": 2, "seqs": {"m": 2}})
+        await backend.events.insert_one(event(2, 2))
+        await asyncio.sleep(0.15)
+        await backend.events.insert_one(event(1, 1))
+        await backend.publish("m", {"type": "event-3"})
+        await asyncio.sleep(0.3)
+
+    assert run_tail(backend, scenario) == [("m", 1, "event-1"), ("m", 2, "event-2"), ("m", 3, "event-3")]
+
+
+def test_a_position_never_appended_is_skipped_after_the_timeout(backend):
+    async def scenario():
+        # A publisher took position 1 and died before appending it
+        await backend.counters.insert_one({"_id": backend.COUNTER_ID, "position": 1, "seqs": {"m": 1}})
+        await backend.publish("m", {"type": "event-2"})
+        await asyncio.sleep(0.1)
+        assert await backend.events.count_documents({"position": {"$exists": True}}) == 1
+        await asyncio.sleep(0.5)
+
+    assert run_tail(backend, scenario) == [("m", 2, "event-2")]
+
+
+def test_meeting_seq_is_dropped_with_the_meeting(backend):
+    async def scenario():
+        await backend.publish("m", {"type": "poll_started"})
+        await backend.publish("m", {"type": "meeting_completed"})
+        await asyncio.sleep(0.3)
+        counter = await backend.counters.find_one({"_id": backend.COUNTER_ID})
+        assert counter["position"] == 2 and counter["seqs"] == {}
+
+    assert [seq for _, seq, _ in run_tail(backend, scenario)] == [1, 2]
+
+
+def test_in_memory_seq_is_dropped_with_the_meeting(server):
+    backend = server.InMemoryBroadcastBackend()
+    received = []
+
+    async def handler(meeting_id, seq, message):
+        received.append(seq)
+
+    async def main():
+        await backend.start(handler)
+        await backend.publish("m", {"type": "poll_started"})
+        await backend.publish("m", {"type": "meeting_completed"})
+    asyncio.run(main())
+    assert received == [1, 2]
+    assert backend.sequences == {}
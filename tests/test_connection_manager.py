@@ -0,0 +1,52 @@
+import asyncio
+
+
+def test_wait_for_change_forgets_unknown_meetings(server):
+    manager = server.ConnectionManager(backend=None)
+
+    async def main():
+        await asyncio.gather(*(manager.wait_for_change(f"unknown-{i}", timeout=0.01) for i in range(50)))
+        return manager.change_events, manager.change_waiters
+    assert asyncio.run(main()) == ({}, {})
+
+
+def test_wait_for_change_keeps_the_event_of_remaining_waiters(server):
+    manager = server.ConnectionManager(backend=None)
+
+    async def main():
+        long_wait = asyncio.create_task(manager.wait_for_change("meeting", timeout=5))
+        await manager.wait_for_change("meeting", timeout=0.01)
+        assert "meeting" in manager.change_events
+        await manager.deliver("meeting", 1, {"type": "poll_started", "poll_id": "p"})
+        await asyncio.wait_for(long_wait, timeout=1)
+        return manager.change_events, manager.change_waiters
+    assert asyncio.run(main()) == ({}, {})
+
+
+def deliver_votes(manager, meeting_id, count):
+    async def main():
+        for seq in range(1, count + 1):
+            await manager.deliver(meeting_id, seq, {"type": "vote_submitted", "poll_id": "p", "counts": [seq]})
+    asyncio.run(main())
+
+
+def test_replay_is_bounded_by_the_buffer_not_the_socket_queue(server):
+    manager = server.ConnectionManager(backend=None, queue_size=10, replay_buffer_size=50)
+    deliver_votes(manager, "meeting", 60)
+    assert len(manager.events_since("meeting", 20)) == 40
+    assert manager.events_since("meeting", 5) is None
+
+
+def test_socket_too_far_behind_for_its_queue_gets_a_snapshot(server, monkeypatch):
+    from fastapi.testclient import TestClient
+
+    monkeypatch.setattr(server.manager, "queue_size", 10)
+    deliver_votes(server.manager, "meeting", 30)
+    client = TestClient(server.app)
+    try:
+        with client.websocket_connect("/ws/meetings/meeting?since=25") as ws:
+            assert ws.receive_json()["seq"] == 26
+        with client.websocket_connect("/ws/meetings/meeting?since=5") as ws:
+            assert ws.receive_json() == {"type": "snapshot", "seq": 30, "participants": [], "polls": []}
+    finally:
+        server.manager.release_meeting("meeting")
@@ -0,0 +1,41 @@
+import asyncio
+
+import httpx
+import pytest
+
+
+def import_roster(server, **body):
+    async def main():
+        transport = httpx.ASGITransport(app=server.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            meeting = (await client.post("/api/meetings", json={"title": "AG", "organizer_name": "Bureau"})).json()
+            response = await client.post(f"/api/meetings/{meeting['id']}/participants/import", **body)
+            stored = await server.db.participants.count_documents({"meeting_id": meeting["id"]})
+            return response, stored
+    return asyncio.run(main())
+
+
+@pytest.mark.parametrize("roster", [[{"name": 5}], [None], [5], [["a"]], ["Alice", {"nom": "Bob"}]])
+def test_invalid_json_entries_are_rejected(server, roster):
+    response, stored = import_roster(server, json=roster)
+    assert response.status_code == 400
+    assert stored == 0
+
+
+def test_json_names_and_objects(server):
+    response, stored = import_roster(server, json=["Alice", {"name": "Bob"}])
+    assert response.status_code == 200
+    assert sorted(member["name"] for member in response.json()["members"]) == ["Alice", "Bob"]
+    assert stored == 2
+
+
+@pytest.mark.parametrize("csv_body, names", [
+    ("Nom;Prénom\nDupont;Jean\nDupont;Marie\n", ["Jean Dupont", "Marie Dupont"]),
+    ("name,email\nAlice,a@example.org\nBob,b@example.org", ["Alice", "Bob"]),
+    ("Alice\nBob\n", ["Alice", "Bob"]),
+    ("Martin;Paul\nPetit;Léa\n", ["Martin", "Petit"]),
+])
+def test_csv_delimiters(server, csv_body, names):
+    response, _ = import_roster(server, content=csv_body.encode(), headers={"content-type": "text/csv"})
+    assert response.status_code == 200
+    assert sorted(member["name"] for member in response.json()["members"]) == names
@@ -0,0 +1,22 @@
+import asyncio
+
+import httpx
+
+
+def test_snapshot_is_revalidated_with_a_weak_etag(server):
+    async def main():
+        transport = httpx.ASGITransport(app=server.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            meeting = (await client.post("/api/meetings", json={"title": "AG", "organizer_name": "Bureau"})).json()
+            participant = (await client.post("/api/participants/join", json={
+                "name": "Alice", "meeting_code": meeting["meeting_code"]
+            })).json()
+            url = f"/api/meetings/{meeting['id']}/participants/{participant['id']}/snapshot"
+            first = await client.get(url)
+            again = await client.get(url, headers={"If-None-Match": first.headers["etag"]})
+            return first, again
+
+    first, again = asyncio.run(main())
+    assert first.status_code == 200
+    assert first.headers["etag"].startswith('W/"')
+    assert again.status_code == 304
@@ -0,0 +1,173 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+
+async def start_meeting_poll(client):
+    meeting = (await client.post("/api/meetings", json={"title": "AG", "organizer_name": "Bureau"})).json()
+    poll = (await client.post(f"/api/meetings/{meeting['id']}/polls",
+                              json={"question": "Q", "options": ["Pour", "Contre"]})).json()
+    await client.post(f"/api/polls/{poll['id']}/start")
+    return poll
+
+
+def vote(client, poll):
+    return client.post("/api/votes", json={"poll_id": poll["id"], "option_id": poll["options"][0]["id"]})
+
+
+class SlowCollection:
+    """Delays one method of a collection to widen a race window"""
+
+    def __init__(self, collection, method, delay):
+        self.collection = collection
+        self.method = method
+        self.delay = delay
+
+    def __getattr__(self, name):
+        attribute = getattr(self.collection, name)
+        if name != self.method:
+            return attribute
+
+        async def slow(*args, **kwargs):
+            await asyncio.sleep(self.delay)
+            return await attribute(*args, **kwargs)
+        return slow
+
+
+class SlowDatabase:
+    def __init__(self, database, collection, method, delay):
+        self.database = database
+        self.slow = SlowCollection(database[collection], method, delay)
+        self.collection = collection
+
+    def __getattr__(self, name):
+        return self.slow if name == self.collection else getattr(self.database, name)
+
+
+def run_with_engine(server, scenario):
+    async def main():
+        server.tally_engine.start()
+        try:
+            transport = httpx.ASGITransport(app=server.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                return await scenario(client)
+        finally:
+            await server.tally_engine.stop()
+    return asyncio.run(main())
+
+
+@pytest.mark.parametrize("collection, method", [("polls", "update_one"), ("votes", "insert_many")])
+def test_no_vote_lands_after_close(server, collection, method):
+    async def scenario(client):
+        poll = await start_meeting_poll(client)
+        assert (await vote(client, poll)).status_code == 200
+
+        database = server.db
+        server.db = SlowDatabase(database, collection, method, 0.1)
+        try:
+            if method == "insert_many":
+                # A vote whose batch is being written when the close begins
+                in_flight = asyncio.create_task(vote(client, poll))
+                await asyncio.sleep(0.02)
+            closing = asyncio.create_task(client.post(f"/api/polls/{poll['id']}/close"))
+            await asyncio.sleep(0.02)
+            late = await vote(client, poll)
+            assert (await closing).status_code == 200
+            if method == "insert_many":
+                assert (await in_flight).status_code == 200
+        finally:
+            server.db = database
+
+        stored = await server.db.polls.find_one({"id": poll["id"]})
+        return late, await server.db.votes.count_documents({"poll_id": poll["id"]}), stored
+
+    late, recorded, stored = run_with_engine(server, scenario)
+    assert late.status_code == 400
+    expected = 2 if method == "insert_many" else 1
+    assert recorded == expected
+    assert stored["status"] == "closed"
+    assert sum(option["votes"] for option in stored["options"]) == expected
+
+
+
+
+@pytest.mark.parametrize("close_during_write", [False, True])
+def test_votes_for_a_poll_closed_by_another_worker_are_refused(server, close_during_write):
+    async def scenario(client):
+        poll = await start_meeting_poll(client)
+        assert (await vote(client, poll)).status_code == 200
+
+        async def close_elsewhere():
+            # Another worker closed the poll; its poll_closed event has not arrived yet
+            await server.db.polls.update_one({"id": poll["id"]}, {"$set": {"status": "closed"}})
+
+        database = server.db
+        if close_during_write:
+            server.db = SlowDatabase(database, "votes", "insert_many", 0.1)
+        try:
+            late = asyncio.create_task(vote(client, poll))
+            if close_during_write:
+                await asyncio.sleep(0.05)
+            await close_elsewhere()
+            late = await late
+        finally:
+            server.db = database
+
+        stored = await server.db.polls.find_one({"id": poll["id"]})
+        return late, await server.db.votes.count_documents({"poll_id": poll["id"]}), stored
+
+    late, recorded, stored = run_with_engine(server, scenario)
+    assert late.status_code == 400
+    assert recorded == 1
+    assert sum(option["votes"] for option in stored["options"]) == 1
+    assert stored["id"] not in server.tally_engine.active_polls
+
+
+def test_no_vote_lands_after_report(server, monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+
+    def slow_render(*args):
+        time.sleep(0.2)
+        return b"%PDF-"
+
+    monkeypatch.setattr(server, "report_executor", ThreadPoolExecutor(max_workers=1))
+    monkeypatch.setattr(server, "generate_pdf_report", slow_render)
+
+    async def scenario(client):
+        poll = await start_meeting_poll(client)
+        assert (await vote(client, poll)).status_code == 200
+
+        database = server.db
+        server.db = SlowDatabase(database, "polls", "delete_many", 0.1)
+        try:
+            report = asyncio.create_task(client.get(f"/api/meetings/{poll['meeting_id']}/report"))
+            await asyncio.sleep(0.05)
+            during_render = await vote(client, poll)
+            await asyncio.sleep(0.25)
+            during_delete = await vote(client, poll)
+            assert (await report).status_code == 200
+        finally:
+            server.db = database
+        return during_render, during_delete, await server.db.votes.count_documents({})
+
+    during_render, during_delete, remaining = run_with_engine(server, scenario)
+    # Refused while the report runs, or not found once the poll is deleted
+    assert during_render.status_code == 400
+    assert during_delete.status_code in (400, 404)
+    assert remaining == 0
+
+
+def test_reconcile_is_refused_while_votes_are_accepted(server):
+    async def scenario(client):
+        poll = await start_meeting_poll(client)
+        await vote(client, poll)
+        refused = await client.get(f"/api/polls/{poll['id']}/results", params={"reconcile": True})
+        await client.post(f"/api/polls/{poll['id']}/close")
+        return refused, await client.get(f"/api/polls/{poll['id']}/results", params={"reconcile": True})
+
+    refused, reconciled = run_with_engine(server, scenario)
+    assert refused.status_code == 400
+    assert reconciled.status_code == 200
+    assert reconciled.json()["total_votes"] == 1
@@ -0,0 +1,56 @@
+import asyncio
+import logging
+import types
+
+import httpx
+from prometheus_client import REGISTRY
+
+
+def run_command(listener, name, collection, micros):
+    command = {"collection": collection} if name == "getMore" else {name: collection}
+    listener.started(types.SimpleNamespace(command_name=name, command=command, connection_id=("h", 1), request_id=1))
+    listener.succeeded(types.SimpleNamespace(command_name=name, connection_id=("h", 1), request_id=1,
+                                             duration_micros=micros))
+
+
+def test_broadcast_tail_getmores_are_not_slow_queries(server, caplog):
+    listener = server.MongoCommandListener()
+    samples = lambda: REGISTRY.get_sample_value(
+        "vote_mongo_command_duration_seconds_count",
+        {"command": "getMore", "collection": "meeting_events", "route": "background"}
+    )
+    before = samples()
+    with caplog.at_level(logging.WARNING, logger="server"):
+        run_command(listener, "getMore", "meeting_events", 1_000_000)
+        run_command(listener, "getMore", "votes", 1_000_000)
+    assert samples() == before
+    assert [record.getMessage().split(" took")[0] for record in caplog.records] == ["Slow MongoDB getMore on votes"]
+
+
+def test_vote_timing_covers_its_batch_but_not_the_tally_broadcast(server, monkeypatch):
+    seen = []
+
+    async def broadcast_later(poll_id, meeting_id):
+        seen.append(server.request_timings.get())
+        server.vote_broadcaster.scheduled.pop(poll_id, None)
+    monkeypatch.setattr(server.vote_broadcaster, "_broadcast_later", broadcast_later)
+
+    async def main():
+        server.tally_engine.start()
+        try:
+            transport = httpx.ASGITransport(app=server.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                meeting = (await client.post("/api/meetings", json={"title": "AG", "organizer_name": "B"})).json()
+                poll = (await client.post(f"/api/meetings/{meeting['id']}/polls",
+                                          json={"question": "Q", "options": ["Pour", "Contre"]})).json()
+                await client.post(f"/api/polls/{poll['id']}/start")
+                response = await client.post("/api/votes", json={"poll_id": poll["id"],
+                                                                  "option_id": poll["options"][0]["id"]})
+                await asyncio.sleep(0)
+                return response
+        finally:
+            await server.tally_engine.stop()
+
+    response = asyncio.run(main())
+    assert "vote-batch;dur=" in response.headers["server-timing"]
+    assert seen == [None]